@@ -0,0 +1,69 @@
+"""
+Typed conversion of numeric text columns.
+
+Values extracted from XML arrive as strings. When NumPy is installed the
+strings are converted into typed arrays in C, otherwise the columns are
+converted value by value in Python.
+"""
+
+import functools
+import importlib
+from typing import Any, Callable, List, Optional
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Import NumPy on first use, or return None if it is not installed."""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+def _convert(values: List[Any], dtype: str, convert: Callable[[Any], Any]) -> Any:
+    """
+    Convert a column to a typed NumPy array or fall back to Python.
+
+    Args:
+        values: Column values, None marks a missing value.
+        dtype: NumPy dtype name of the result.
+        convert: Python conversion applied when NumPy cannot be used.
+
+    Returns:
+        NumPy array, or list with missing values kept as None.
+    """
+    np = _numpy()
+
+    if np is not None:
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError):
+            pass
+
+    return [None if value is None else convert(value) for value in values]
+
+
+def parse_floats(values: List[Optional[str]]) -> Any:
+    """
+    Convert a column of numeric text to float64.
+
+    Args:
+        values: Column values, None marks a missing value.
+
+    Returns:
+        float64 NumPy array with missing values as NaN, or list of floats.
+    """
+    return _convert(values, "float64", float)
+
+
+def parse_ints(values: List[Optional[str]]) -> Any:
+    """
+    Convert a column of integer text to int64.
+
+    Args:
+        values: Column values, None marks a missing value.
+
+    Returns:
+        int64 NumPy array, or list of ints if values are missing.
+    """
+    return _convert(values, "int64", int)
@@ -5,9 +5,11 @@ This module provides automatic detection and abstraction for different
 DataFrame libraries (pandas, polars, dask, pyspark).
 """
 
+import functools
 import importlib
+import importlib.util
 from enum import Enum
-from typing import Any, Dict, List, Optional, Protocol, Union, runtime_checkable
+from typing import Any, Dict, List, Optional, Protocol, Union, cast, runtime_checkable
 
 
 class DataFrameLibrary(Enum):
@@ -18,6 +20,19 @@ class DataFrameLibrary(Enum):
     PYSPARK = "pyspark"
 
 
+# Top-level modules that must be installed for each library
+_LIBRARY_MODULES = {
+    DataFrameLibrary.PANDAS: ("pandas",),
+    DataFrameLibrary.POLARS: ("polars",),
+    DataFrameLibrary.DASK: ("dask", "pandas"),
+    DataFrameLibrary.PYSPARK: ("pyspark",),
+}
+
+
+# Row-wise records or column-wise lists, both accepted by create_dataframe
+DataFrameData = Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+
+
 @runtime_checkable
 class DataFrameLike(Protocol):
     """Protocol for DataFrame-like objects."""
@@ -37,48 +52,45 @@ class DataFrameLibraryDetector:
         """Initialize the detector and scan for available libraries."""
         self._available_libraries = {}
         self._constructors = {}
+        self._spark_session = None
         self._detect_libraries()
 
     def _detect_libraries(self) -> None:
-        """Detect which DataFrame libraries are available."""
-        # Test pandas
-        try:
-            pd = importlib.import_module("pandas")
-            self._available_libraries[DataFrameLibrary.PANDAS] = pd
-            self._constructors[DataFrameLibrary.PANDAS] = pd.DataFrame
-        except ImportError:
-            pass
-
-        # Test polars
-        try:
-            pl = importlib.import_module("polars")
-            self._available_libraries[DataFrameLibrary.POLARS] = pl
-            self._constructors[DataFrameLibrary.POLARS] = pl.DataFrame
-        except ImportError:
-            pass
+        """
+        Detect which DataFrame libraries are installed.
 
-        # Test dask
-        try:
+        Only the import machinery is consulted, the libraries themselves are
+        imported on first use by get_constructor. This keeps heavy packages
+        such as pyspark out of the import time of xmlforge.
+        """
+        for library, modules in _LIBRARY_MODULES.items():
+            try:
+                specs = [importlib.util.find_spec(module) for module in modules]
+            except (ImportError, ValueError):
+                continue
+
+            if all(specs):
+                self._available_libraries[library] = specs[0]
+
+    def _load_constructor(self, library: DataFrameLibrary) -> Any:
+        """Import a library and create its DataFrame constructor."""
+        if library == DataFrameLibrary.PANDAS:
+            return importlib.import_module("pandas").DataFrame
+        elif library == DataFrameLibrary.POLARS:
+            return importlib.import_module("polars").DataFrame
+        elif library == DataFrameLibrary.DASK:
             dask_df = importlib.import_module("dask.dataframe")
             pd = importlib.import_module("pandas")  # Dask needs pandas
-            self._available_libraries[DataFrameLibrary.DASK] = dask_df
             # Dask constructor is more complex
-            self._constructors[DataFrameLibrary.DASK] = self._create_dask_constructor(dask_df, pd)
-        except ImportError:
-            pass
-
-        # Test pyspark
-        try:
-            spark_sql = importlib.import_module("pyspark.sql")
-            self._available_libraries[DataFrameLibrary.PYSPARK] = spark_sql
+            return self._create_dask_constructor(dask_df, pd)
+        else:
+            importlib.import_module("pyspark.sql")
             # PySpark constructor needs active SparkSession
-            self._constructors[DataFrameLibrary.PYSPARK] = self._create_pyspark_constructor()
-        except ImportError:
-            pass
+            return self._create_pyspark_constructor()
 
     def _create_dask_constructor(self, dask_df, pd):
         """Create Dask DataFrame constructor."""
-        def create_dask_df(data: List[Dict[str, Any]], npartitions: int = 1):
+        def create_dask_df(data: DataFrameData, npartitions: int = 1):
             pandas_df = pd.DataFrame(data)
             return dask_df.from_pandas(pandas_df, npartitions=npartitions)
 
@@ -86,21 +98,40 @@ class DataFrameLibraryDetector:
 
     def _create_pyspark_constructor(self):
         """Create PySpark DataFrame constructor."""
-        def create_spark_df(data: List[Dict[str, Any]]):
-            try:
-                from pyspark.sql import SparkSession  # type: ignore
-                spark = SparkSession.getActiveSession()
+        def create_spark_df(data: DataFrameData):
+            # Spark only builds frames from rows
+            if isinstance(data, dict):
+                data = [dict(zip(data, values)) for values in zip(*data.values())]
 
-                if spark is None:
-                    # Create a default session if none exists
-                    spark = SparkSession.builder.appName("XMLForge").getOrCreate()
-
-                return spark.createDataFrame(data)
+            try:
+                return self._create_with_spark(data)
             except Exception as e:
                 raise RuntimeError(f"Could not create PySpark DataFrame: {e}")
 
         return create_spark_df
 
+    def _get_spark_session(self) -> Any:
+        """Get the cached SparkSession, looking one up on first use or once it is stopped."""
+        spark = self._spark_session
+
+        # SparkContext.stop() drops the Java context, a plain attribute check
+        # that needs no JNI round trip
+        if spark is None or spark.sparkContext._jsc is None:
+            from pyspark.sql import SparkSession  # type: ignore
+            spark = SparkSession.getActiveSession()
+
+            if spark is None:
+                # Create a default session if none exists
+                spark = SparkSession.builder.appName("XMLForge").getOrCreate()
+
+            self._spark_session = spark
+
+        return spark
+
+    def _create_with_spark(self, data: Any) -> Any:
+        """Create a PySpark DataFrame with the cached SparkSession."""
+        return self._get_spark_session().createDataFrame(data)
+
     def is_available(self, library: DataFrameLibrary) -> bool:
         """
         Check if a DataFrame library is available.
@@ -126,7 +157,8 @@ class DataFrameLibraryDetector:
         """
         Get the preferred library based on performance and features.
 
-        Priority order: Polars > Pandas > Dask > PySpark
+        Priority order: Polars > Pandas > Dask > PySpark. The chosen library
+        is imported, so one that is installed but cannot be imported is skipped.
 
         Returns:
             The preferred DataFrame library, or None if none are available.
@@ -139,8 +171,17 @@ class DataFrameLibraryDetector:
         ]
 
         for lib in preference_order:
-            if self.is_available(lib):
-                return lib
+            if not self.is_available(lib):
+                continue
+
+            try:
+                # Import it now, an installed package may still fail to import,
+                # e.g. dask without dask.dataframe; then try the next one
+                self.get_constructor(lib)
+            except ImportError:
+                continue
+
+            return lib
 
         return None
 
@@ -160,10 +201,22 @@ class DataFrameLibraryDetector:
         if not self.is_available(library):
             raise ImportError(f"{library.value} is not available")
 
-        return self._constructors[library]
+        constructor = self._constructors.get(library)
+
+        if constructor is None:
+            try:
+                constructor = self._load_constructor(library)
+            except ImportError:
+                # Installed but not importable, e.g. missing optional extras
+                del self._available_libraries[library]
+                raise
+
+            self._constructors[library] = constructor
+
+        return constructor
 
     def create_dataframe(
-        self, data: List[Dict[str, Any]],
+        self, data: DataFrameData,
         library: Optional[DataFrameLibrary] = None,
         **kwargs
     ) -> DataFrameLike:
@@ -171,7 +224,7 @@ class DataFrameLibraryDetector:
         Create a DataFrame using the specified or preferred library.
 
         Args:
-            data: List of dictionaries to convert to DataFrame.
+            data: List of row dictionaries or dictionary of column lists.
             library: Specific library to use, or None for auto-detection.
             **kwargs: Additional arguments for the DataFrame constructor.
 
@@ -193,6 +246,9 @@ class DataFrameLibraryDetector:
         if library == DataFrameLibrary.DASK:
             npartitions = kwargs.pop('npartitions', 1)
             return constructor(data, npartitions=npartitions)
+        elif library == DataFrameLibrary.PANDAS and isinstance(data, dict):
+            # Columns are freshly built lists, no need to copy them again
+            return constructor(data, copy=False)
         else:
             return constructor(data)
 
@@ -233,6 +289,48 @@ class DataFrameLibraryDetector:
 
         return info
 
+    def concat_dataframes(
+        self, frames: List[DataFrameLike],
+        library: Optional[DataFrameLibrary] = None
+    ) -> DataFrameLike:
+        """
+        Concatenate DataFrames of one library row-wise.
+
+        Columns missing from some frames are filled with nulls.
+
+        Args:
+            frames: DataFrames to concatenate, in order.
+            library: Library of the frames, or None for auto-detection.
+
+        Returns:
+            The concatenated DataFrame.
+
+        Raises:
+            ImportError: If no supported DataFrame library is found.
+        """
+        if library is None:
+            library = self._detect_dataframe_type(frames[0]) if frames else None
+
+        if not frames:
+            return self.create_dataframe({}, library)
+
+        if library == DataFrameLibrary.PANDAS:
+            pd = importlib.import_module("pandas")
+            return cast(DataFrameLike, pd.concat(frames, ignore_index=True))
+        elif library == DataFrameLibrary.POLARS:
+            pl = importlib.import_module("polars")
+            return cast(DataFrameLike, pl.concat(frames, how="diagonal_relaxed"))
+        elif library == DataFrameLibrary.DASK:
+            dd = importlib.import_module("dask.dataframe")
+            return cast(DataFrameLike, dd.concat(frames))
+        else:
+            # unionByName is Spark specific, not part of DataFrameLike
+            spark_frames = cast(List[Any], frames)
+            return cast(DataFrameLike, functools.reduce(
+                lambda left, right: left.unionByName(right, allowMissingColumns=True),
+                spark_frames
+            ))
+
     def convert_dataframe(self, df: DataFrameLike,
                          target_library: DataFrameLibrary) -> DataFrameLike:
         """
@@ -302,37 +400,32 @@ class DataFrameLibraryDetector:
             import dask.dataframe as dd  # type: ignore
             return dd.from_pandas(df, npartitions=1)
         elif target_library == DataFrameLibrary.PYSPARK:
-            from pyspark.sql import SparkSession  # type: ignore
-            spark = SparkSession.getActiveSession()
-            if spark is None:
-                spark = SparkSession.builder.appName("XMLForge").getOrCreate()
-            return spark.createDataFrame(df)
+            return self._create_with_spark(df)
         else:
             raise ValueError(f"Cannot convert to {target_library}")
 
 
-# Global detector instance
-_detector = DataFrameLibraryDetector()
-
-
+@functools.lru_cache(maxsize=None)
 def get_detector() -> DataFrameLibraryDetector:
     """
     Get the global DataFrameLibraryDetector instance.
 
+    The detector is created on first call rather than at import time.
+
     Returns:
         The global detector instance.
     """
-    return _detector
+    return DataFrameLibraryDetector()
 
 
-def create_dataframe(data: List[Dict[str, Any]],
+def create_dataframe(data: DataFrameData,
                     library: Optional[Union[str, DataFrameLibrary]] = None,
                     **kwargs) -> DataFrameLike:
     """
     Convenience function to create a DataFrame using the global detector.
 
     Args:
-        data: List of dictionaries to convert to DataFrame.
+        data: List of row dictionaries or dictionary of column lists.
         library: Library name ('pandas', 'polars', 'dask', 'pyspark') or None for auto.
         **kwargs: Additional arguments for the DataFrame constructor.
 
@@ -344,4 +437,24 @@ def create_dataframe(data: List[Dict[str, Any]],
     if library:
         lib_enum = DataFrameLibrary(library)
 
-    return _detector.create_dataframe(data, lib_enum, **kwargs)
+    return get_detector().create_dataframe(data, lib_enum, **kwargs)
+
+
+def concat_dataframes(frames: List[DataFrameLike],
+                      library: Optional[Union[str, DataFrameLibrary]] = None) -> DataFrameLike:
+    """
+    Convenience function to concatenate DataFrames using the global detector.
+
+    Args:
+        frames: DataFrames to concatenate, in order.
+        library: Library name ('pandas', 'polars', 'dask', 'pyspark') or None for auto.
+
+    Returns:
+        The concatenated DataFrame.
+    """
+    lib_enum = None
+
+    if library:
+        lib_enum = DataFrameLibrary(library)
+
+    return get_detector().concat_dataframes(frames, lib_enum)
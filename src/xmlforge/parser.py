@@ -2,22 +2,119 @@
 XML Parser module for parsing XML documents.
 """
 
+import functools
+import mmap
+import os
+import sys
+import threading
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 
 from lxml import etree
+
+from xmlforge._numeric import parse_floats, parse_ints
 from xmlforge.dataframe import DataFrameLibrary, DataFrameLike, create_dataframe, get_detector
 
+# Column converters for EntityParser.column_types
+_COLUMN_CONVERTERS = {float: parse_floats, int: parse_ints}
+
+# Files larger than this are parsed from a memory map instead of through stdio
+_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Element layouts for XMLParser.compile_to_dict: (tag, child positions, type or None)
+_Layout = Tuple[Tuple[str, Tuple[int, ...], Optional[Callable[[str], Any]]], ...]
+
+# Converters generated by XMLParser.compile_to_dict are cached by element layout.
+# The cache is bounded, since types given as new lambdas make new layouts
+_CONVERTER_CACHE_SIZE = 256
+
+
+def _local_name(tag: str) -> str:
+    """Strip the ``{namespace}`` prefix from a Clark-notation tag."""
+    # rpartition returns ("", "", tag) when there is no namespace
+    return tag.rpartition("}")[2]
+
+
+class _ColumnBuffer:
+    """
+    Collects entity dictionaries column by column.
+
+    DataFrame libraries store data by column, so handing them column lists
+    avoids a row-to-column transpose during frame construction. Keys missing
+    from an entity are filled with None.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self.columns: Dict[str, List[Any]] = {}
+        self.rows = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered rows."""
+        return self.rows
+
+    def extend(self, entities: List[Dict[str, Any]]) -> None:
+        """
+        Append entity dictionaries to the columns.
+
+        Args:
+            entities: Dictionaries returned by parse_entity.
+        """
+        columns = self.columns
+
+        for entity in entities:
+            rows = self.rows
+
+            for key, value in entity.items():
+                column = columns.get(key)
+
+                if column is None:
+                    column = columns[key] = [None] * rows
+
+                column.append(value)
+
+            rows += 1
+            self.rows = rows
+
+            # Only entities lacking some known key need padding
+            if len(entity) < len(columns):
+                for column in columns.values():
+                    if len(column) < rows:
+                        column.append(None)
+
 
 class EntityParser(ABC):
-    """Abstract base class for entity parsers."""
+    """
+    Abstract base class for entity parsers.
+
+    Attributes:
+        index_tags (bool): If True, each entity is indexed by tag once and
+            handed to parse_entity_indexed instead of parse_entity.
+        column_types (Dict[str, type]): Columns to convert to ``float`` or
+            ``int`` before the DataFrame is built.
+    """
+
+    index_tags: bool = False
+    column_types: Dict[str, type] = {}
+
+    def __init__(
+        self,
+        dataframe_library: Optional[Union[str, DataFrameLibrary]] = None,
+        target_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the EntityParser.
 
-    def __init__(self, dataframe_library: Optional[Union[str, DataFrameLibrary]] = None) -> None:
-        """Initialize the EntityParser."""
+        Args:
+            dataframe_library: DataFrame library to build results with, or None for auto.
+            target_tag: Only parse chunk children with this tag. Defaults to all children.
+        """
         super().__init__()
 
         self.detector = get_detector()
+        self.target_tag = target_tag
 
         if dataframe_library is None:
             self.preferred_library = self.detector.get_preferred_library()
@@ -27,21 +124,150 @@ class EntityParser(ABC):
 
             self.preferred_library = dataframe_library
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the detector when pickling, e.g. for worker processes."""
+        state = self.__dict__.copy()
+        del state["detector"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled parser with the global detector."""
+        self.__dict__.update(state)
+        self.detector = get_detector()
+
     def parse(self, chunk: etree._Element, **kwargs) -> DataFrameLike:
         """Parse the input data and return a structured representation."""
-        entities = []
+        entities = _ColumnBuffer()
+        # lxml filters by tag in C; without a tag every child is yielded
+        elements = chunk.iterchildren(self.target_tag)
+
+        if self.index_tags:
+            for element in elements:
+                data = self.parse_entity_indexed(element, self._index_entity(element))
+                entities.extend(data)
+        else:
+            for element in elements:
+                data = self.parse_entity(element)
+                entities.extend(data)
+
+        return self._create_dataframe(entities, **kwargs)
+
+    def iter_parse(
+        self, elements: Iterable[etree._Element], batch_size: int = 10_000, **kwargs: Any
+    ) -> Iterator[DataFrameLike]:
+        """
+        Parse a stream of entity elements into DataFrames of bounded size.
+
+        Unlike :meth:`parse`, no chunk element is needed: entities are written
+        to the column buffers as the elements arrive, and a DataFrame is
+        yielded every ``batch_size`` rows.
+
+        Args:
+            elements: The entity elements to parse.
+            batch_size: Number of rows per DataFrame. Defaults to 10000.
+            **kwargs: Additional arguments for the DataFrame constructor.
+
+        Yields:
+            DataFrames with up to batch_size rows each.
+        """
+        entities = _ColumnBuffer()
+        index_tags = self.index_tags
+
+        for element in elements:
+            if index_tags:
+                data = self.parse_entity_indexed(element, self._index_entity(element))
+            else:
+                data = self.parse_entity(element)
 
-        for element in chunk:
-            data = self.parse_entity(element)
             entities.extend(data)
 
-        return create_dataframe(entities, library=self.preferred_library, **kwargs)
+            if len(entities) >= batch_size:
+                yield self._create_dataframe(entities, **kwargs)
+                entities = _ColumnBuffer()
+
+        if len(entities):
+            yield self._create_dataframe(entities, **kwargs)
+
+    def _create_dataframe(self, entities: _ColumnBuffer, **kwargs: Any) -> DataFrameLike:
+        """
+        Create a DataFrame from buffered entities.
+
+        Args:
+            entities: The buffered entity columns.
+            **kwargs: Additional arguments for the DataFrame constructor.
+
+        Returns:
+            DataFrame with typed columns.
+        """
+        columns = self._convert_columns(entities.columns)
+        return create_dataframe(columns, library=self.preferred_library, **kwargs)
 
     @abstractmethod
     def parse_entity(self, element: etree._Element) -> List[Dict[str, Any]]:
         """Parse a single XML element into a dictionary."""
         pass
 
+    def parse_entity_indexed(
+        self, element: etree._Element, index: Dict[str, List[etree._Element]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a single XML element with a prebuilt index of its descendants.
+
+        Subclasses that set ``index_tags`` override this to look fields up in
+        ``index`` instead of calling ``element.find`` once per field. The
+        default falls back to :meth:`parse_entity`.
+
+        Args:
+            element: The XML element to parse.
+            index: Mapping of tag name to descendant elements in document order.
+
+        Returns:
+            List of dictionaries for the entity.
+        """
+        return self.parse_entity(element)
+
+    def _convert_columns(self, columns: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """
+        Convert the columns declared in column_types to typed values.
+
+        Args:
+            columns: Column lists collected from the entities.
+
+        Returns:
+            The columns, with numeric ones converted in place.
+
+        Raises:
+            ValueError: If a declared column type is not supported.
+        """
+        for name, column_type in self.column_types.items():
+            convert = _COLUMN_CONVERTERS.get(column_type)
+
+            if convert is None:
+                raise ValueError(f"Unsupported column type for '{name}': {column_type}")
+
+            if name in columns:
+                columns[name] = convert(columns[name])
+
+        return columns
+
+    @staticmethod
+    def _index_entity(element: etree._Element) -> Dict[str, List[etree._Element]]:
+        """
+        Index the descendants of an element by tag in a single walk.
+
+        Args:
+            element: The XML element to index.
+
+        Returns:
+            Mapping of tag name to descendant elements in document order.
+        """
+        index: Dict[str, List[etree._Element]] = defaultdict(list)
+
+        for descendant in element.iterdescendants(etree.Element):
+            index[descendant.tag].append(descendant)
+
+        return index
+
 
 class XMLParser:
     """
@@ -49,8 +275,11 @@ class XMLParser:
 
     Attributes:
         encoding (str): The encoding to use when parsing XML files.
+        parser (etree.XMLParser): The lxml parser of the calling thread.
     """
 
+    __slots__ = ("encoding", "_local")
+
     def __init__(self, encoding: str = "utf-8") -> None:
         """
         Initialize the XMLParser.
@@ -59,7 +288,26 @@ class XMLParser:
             encoding: The encoding to use for parsing. Defaults to 'utf-8'.
         """
         self.encoding = encoding
-        self.parser = etree.XMLParser(encoding=self.encoding, remove_blank_text=True)
+        self._local = threading.local()
+
+    @property
+    def parser(self) -> etree.XMLParser:
+        """
+        Get the lxml parser for the current thread.
+
+        lxml parsers are not thread-safe, so one parser is created per thread
+        on first use and reused for every later parse in that thread.
+
+        Returns:
+            The cached lxml parser.
+        """
+        parser = getattr(self._local, "parser", None)
+
+        if parser is None:
+            parser = etree.XMLParser(encoding=self.encoding, remove_blank_text=True)
+            self._local.parser = parser
+
+        return parser
 
     def parse_file(self, filepath: Union[str, Path]) -> etree._ElementTree:
         """
@@ -76,11 +324,27 @@ class XMLParser:
             etree.XMLSyntaxError: If the XML is malformed.
         """
         filepath = Path(filepath)
+        fp_str = os.fspath(filepath)
 
-        if not filepath.exists():
+        try:
+            size = os.stat(fp_str).st_size
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {filepath}")
 
-        return etree.parse(str(filepath), self.parser)
+        if size > _MMAP_THRESHOLD:
+            # libxml2 reads straight from the page cache, without copying the
+            # file through its own read buffer first
+            with open(filepath, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # lxml reads any buffer, the stubs only list str and bytes
+                    root = cast(
+                        etree._Element,
+                        etree.fromstring(cast(bytes, mm), self.parser, base_url=fp_str),
+                    )
+
+            return root.getroottree()
+
+        return etree.parse(fp_str, self.parser)
 
     def parse_string(self, xml_string: str) -> etree._Element:
         """
@@ -97,37 +361,151 @@ class XMLParser:
         """
         return etree.fromstring(xml_string.encode(self.encoding), self.parser)
 
-    def to_dict(self, element: etree._Element) -> Dict[str, Any]:
+    def to_dict(
+        self,
+        element: etree._Element,
+        strip_ns: bool = False,
+        tag_filter: Optional[str] = None,
+        copy_attribs: bool = True,
+    ) -> Dict[str, Any]:
         """
         Convert an XML element to a dictionary representation.
 
         Args:
             element: The XML element to convert.
+            strip_ns: If True, use tags without their namespace as keys. Defaults to False.
+            tag_filter: Only convert direct children of element with this tag.
+                Defaults to all children.
+            copy_attribs: If False, store each element's live lxml attribute
+                mapping instead of a dict copy. The mapping is only valid while
+                the element tree is alive. Defaults to True.
 
         Returns:
             A dictionary representation of the XML element.
         """
-        result: Dict[str, Any] = {}
+        result = self._element_dict(element, copy_attribs)
+
+        # Walk the tree with an explicit stack instead of recursion so deep
+        # documents neither pay per-call frame overhead nor hit RecursionError.
+        # Children are attached to their parent dict in document order while
+        # the parent is visited, so no second pass is needed.
+        children = element.iterchildren(tag_filter) if tag_filter else element
+        stack = [(children, result)]
+        pop = stack.pop
+        push = stack.append
+        element_dict = self._element_dict
+        intern = sys.intern
+
+        while stack:
+            children, parent_dict = pop()
+
+            for child in children:
+                child_dict = element_dict(child, copy_attribs)
+                tag = child.tag
+                if isinstance(tag, str):
+                    # lxml returns a new string per access; interning shares one
+                    # key object per tag across all result dicts
+                    tag = intern(_local_name(tag) if strip_ns else tag)
+
+                existing = parent_dict.setdefault(tag, child_dict)
+
+                if existing is not child_dict:
+                    if isinstance(existing, list):
+                        existing.append(child_dict)
+                    else:
+                        parent_dict[tag] = [existing, child_dict]
+
+                if len(child):
+                    push((child, child_dict))
+
+        return result
 
-        # Add attributes
-        if element.attrib:
-            result["@attributes"] = dict(element.attrib)
+    def compile_to_dict(
+        self, sample: etree._Element, types: Optional[Dict[str, Callable[[str], Any]]] = None
+    ) -> Callable[[etree._Element], Dict[str, Any]]:
+        """
+        Compile a converter specialised to the layout of a sample element.
+
+        The generated function reads each child by position and returns a flat
+        record mapping child tags to their text. Text stays a string unless
+        its tag is given a type in ``types``, and tags that repeat produce a
+        list. Elements passed to the converter must have the same children in
+        the same order as the sample; this is not checked. The most recently
+        used converters are cached by layout and types, so compiling many
+        samples of one schema generates code only once.
+
+        Args:
+            sample: An element with the layout of the elements to convert.
+            types: Optional mapping of child tags to the type their text is
+                converted with, such as ``{"year": int}``.
 
-        # Add text content
-        if element.text and element.text.strip():
-            result["@text"] = element.text.strip()
+        Returns:
+            A function converting elements of the sample's layout to records.
+        """
+        types = types or {}
+        positions: Dict[str, List[int]] = {}
 
-        # Add children
-        for child in element:
-            child_dict = self.to_dict(child)
+        for index, child in enumerate(sample):
             tag = child.tag
+            if isinstance(tag, str):
+                positions.setdefault(tag, []).append(index)
+
+        layout = tuple((tag, tuple(indexes), types.get(tag)) for tag, indexes in positions.items())
+        return self._generate_converter(layout)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=_CONVERTER_CACHE_SIZE)
+    def _generate_converter(
+        layout: _Layout,
+    ) -> Callable[[etree._Element], Dict[str, Any]]:
+        """
+        Generate and compile the source of a layout-specific converter.
 
-            if tag in result:
-                if not isinstance(result[tag], list):
-                    result[tag] = [result[tag]]
+        Args:
+            layout: Tuples of (tag, child positions, field type or None for text).
 
-                result[tag].append(child_dict)
+        Returns:
+            The compiled converter function.
+        """
+        fields = []
+        namespace: Dict[str, Any] = {}
+
+        for field, (tag, indexes, field_type) in enumerate(layout):
+            if field_type is None:
+                values = [f"e[{index}].text" for index in indexes]
             else:
-                result[tag] = child_dict
+                # Types are passed in through the namespace, by field number
+                namespace[f"_type{field}"] = field_type
+                values = [f"_type{field}(e[{index}].text)" for index in indexes]
+
+            value = values[0] if len(values) == 1 else f"[{', '.join(values)}]"
+            fields.append(f"{tag!r}: {value}")
+
+        source = f"def _converter(e):\n    return {{{', '.join(fields)}}}\n"
+        exec(compile(source, "<xmlforge.compile_to_dict>", "exec"), namespace)
+
+        return cast(Callable[[etree._Element], Dict[str, Any]], namespace["_converter"])
+
+    @staticmethod
+    def _element_dict(element: etree._Element, copy_attribs: bool = True) -> Dict[str, Any]:
+        """
+        Build the dictionary for a single element without its children.
+
+        Args:
+            element: The XML element to convert.
+            copy_attribs: If False, store the live attribute mapping. Defaults to True.
+
+        Returns:
+            A dictionary holding the element's attributes and text.
+        """
+        result: Dict[str, Any] = {}
+
+        attrib = element.attrib
+        if attrib:
+            result["@attributes"] = {**attrib} if copy_attribs else attrib
+
+        text = (t := element.text) and t.strip()
+        if text:
+            result["@text"] = text
 
         return result
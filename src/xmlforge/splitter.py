@@ -2,15 +2,275 @@
 XML Splitter module for splitting large XML files.
 """
 
+import fnmatch
+import functools
+import io
 import logging
+import os
+import re
+import stat
+import sys
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import groupby, repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterator, Optional, Union
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.parsers import expat
+from xml.sax.saxutils import escape, quoteattr
 
 from lxml import etree
 
+from xmlforge.dataframe import DataFrameLike, concat_dataframes
+from xmlforge.parser import EntityParser
+
 logger = logging.getLogger(__name__)
 
+# Fast deflate level for ZIP output, chunk files compress well even at low levels
+_ZIP_COMPRESSLEVEL = 3
+
+# Read size when checking the CRC of ZIP members
+_ZIP_CHECK_SIZE = 1 << 20
+
+# Options for every iterparse over the inputs: no limits on node size or depth,
+# and only internal entities expanded, so chunks stay self-contained without
+# the DTD while external entities are never fetched
+_ITERPARSE_OPTIONS: Dict[str, Any] = {
+    "events": ("end",),
+    "huge_tree": True,
+    "resolve_entities": "internal",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str, ignore_case: bool = False) -> "re.Pattern[str]":
+    """
+    Compile a glob pattern for file names into a regular expression.
+
+    Args:
+        pattern: Glob pattern such as "*.xml".
+        ignore_case: If True, match regardless of case.
+
+    Returns:
+        The compiled regular expression.
+    """
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE if ignore_case else 0)
+
+
+def _literal_suffix(pattern: str) -> Optional[str]:
+    """
+    Get the literal suffix of a "*" + literal glob pattern.
+
+    Args:
+        pattern: Glob pattern such as "*.xml".
+
+    Returns:
+        The suffix such as ".xml", or None if the pattern has other wildcards.
+    """
+    suffix = pattern[1:]
+    if pattern[:1] == "*" and suffix and not any(c in suffix for c in "*?["):
+        return suffix
+    return None
+
+
+def _parse_chunk_bytes(
+    data: bytes, entity_parser: EntityParser, kwargs: Dict[str, Any]
+) -> DataFrameLike:
+    """
+    Parse a serialized chunk in a worker process.
+
+    Args:
+        data: The chunk serialized with etree.tostring.
+        entity_parser: The entity parser to apply.
+        kwargs: Additional arguments for EntityParser.parse.
+
+    Returns:
+        DataFrame for the chunk.
+    """
+    return entity_parser.parse(etree.fromstring(data), **kwargs)
+
+
+def _split_source(splitter: "XMLSplitter", xml_source: tuple, part_dir: Path) -> int:
+    """
+    Split one XML source into chunk files in a worker process.
+
+    Args:
+        splitter: The splitter whose settings to use.
+        xml_source: Tuple (xml_source, zip_path_or_none).
+        part_dir: Directory to write this source's chunk files.
+
+    Returns:
+        Number of chunk files written.
+    """
+    chunk_num = 0
+
+    for chunk in splitter._iter_chunks([xml_source]):
+        splitter._write_chunk(chunk, part_dir, chunk_num)
+        chunk_num += 1
+
+    return chunk_num
+
+
+class _SAXChunkWriter:
+    """
+    Expat handler that copies target elements verbatim into chunk files.
+
+    No element objects are built: the markup of every target subtree is
+    re-emitted into a text buffer and flushed to disk once the chunk is full.
+    Names are matched in Clark notation like lxml does, and each copied
+    target element declares the namespaces in scope where it was found.
+    """
+
+    def __init__(self, target_tag: str, chunk_size: int, output_dir: Path) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            target_tag: The XML tag to use as split points.
+            chunk_size: Number of elements per chunk.
+            output_dir: Directory to write chunk files.
+        """
+        self.target_tag = target_tag
+        self.chunk_size = chunk_size
+        self.output_dir = output_dir
+        self.chunk_num = 0
+
+        self._buffer: List[str] = []
+        self._count = 0
+        self._depth = 0
+
+        # In-scope URIs per prefix (None is the default namespace), and the
+        # declarations made on the element about to start
+        self._namespaces: Dict[Optional[str], List[str]] = {}
+        self._declared: List[Tuple[Optional[str], str]] = []
+        # Expat names ("uri}local}prefix") resolved to qualified names, and the
+        # expat names that are the target tag
+        self._names: Dict[str, str] = {}
+        self._targets: Set[str] = set()
+
+    def feed(self, xml_file: IO[bytes]) -> None:
+        """
+        Parse one XML document and buffer its target elements.
+
+        Args:
+            xml_file: Binary file object to read the document from.
+        """
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.StartNamespaceDeclHandler = self._start_namespace
+        parser.EndNamespaceDeclHandler = self._end_namespace
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+
+        self._depth = 0
+        self._namespaces = {}
+        self._declared = []
+        parser.ParseFile(xml_file)
+
+    def close(self) -> None:
+        """Flush any remaining buffered elements."""
+        if self._count:
+            self._flush()
+
+    def _resolve(self, name: str) -> str:
+        """
+        Convert an expat name into its qualified name, noting if it is the target tag.
+
+        Args:
+            name: Name reported by expat, "uri}local}prefix", "uri}local" or "local".
+
+        Returns:
+            The qualified name, such as "prefix:local".
+        """
+        parts = name.split("}")
+        if len(parts) == 3:
+            clark, qname = f"{{{parts[0]}}}{parts[1]}", f"{parts[2]}:{parts[1]}"
+        elif len(parts) == 2:
+            clark, qname = f"{{{parts[0]}}}{parts[1]}", parts[1]
+        else:
+            clark = qname = name
+
+        # Match in Clark notation, as lxml reports tags
+        if clark == self.target_tag:
+            self._targets.add(name)
+
+        self._names[name] = qname
+        return qname
+
+    def _start_namespace(self, prefix: Optional[str], uri: Optional[str]) -> None:
+        """Track a namespace declaration for the element about to start."""
+        uri = uri or ""
+        self._namespaces.setdefault(prefix, []).append(uri)
+        self._declared.append((prefix, uri))
+
+    def _end_namespace(self, prefix: Optional[str]) -> None:
+        """Drop a namespace declaration that went out of scope."""
+        self._namespaces[prefix].pop()
+
+    def _start(self, name: str, attrs: Dict[str, str]) -> None:
+        """Copy a start tag if it opens or lies inside a target element."""
+        names = self._names
+        qname = names.get(name) or self._resolve(name)
+
+        declared = self._declared
+        if declared:
+            self._declared = []
+
+        if self._depth:
+            self._depth += 1
+        elif name in self._targets:
+            self._depth = 1
+            # Declare everything in scope, the chunk has no ancestors to inherit from
+            declared = [
+                (prefix, uris[-1]) for prefix, uris in self._namespaces.items() if uris and uris[-1]
+            ]
+        else:
+            return
+
+        append = self._buffer.append
+        append(f"<{qname}")
+        for prefix, uri in declared:
+            append(f" xmlns:{prefix}=" if prefix else " xmlns=")
+            append(quoteattr(uri))
+        for key, value in attrs.items():
+            append(f" {names.get(key) or self._resolve(key)}={quoteattr(value)}")
+        append(">")
+
+    def _end(self, name: str) -> None:
+        """Copy an end tag and count finished target elements."""
+        if not self._depth:
+            return
+
+        self._buffer.append(f"</{self._names[name]}>")
+        self._depth -= 1
+
+        if not self._depth:
+            self._count += 1
+            if self._count >= self.chunk_size:
+                self._flush()
+
+    def _data(self, data: str) -> None:
+        """Copy character data found inside a target element."""
+        if self._depth:
+            self._buffer.append(escape(data))
+
+    def _flush(self) -> None:
+        """Write the buffered elements to the next chunk file."""
+        output_file = self.output_dir / f"chunk_{self.chunk_num:04d}.xml"
+
+        with open(output_file, "wb") as f:
+            f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n<chunk>")
+            f.write("".join(self._buffer).encode("utf-8"))
+            f.write(b"</chunk>\n")
+
+        self._buffer = []
+        self._count = 0
+        self.chunk_num += 1
+
 
 class XMLSplitter:
     """
@@ -19,30 +279,57 @@ class XMLSplitter:
     Attributes:
         chunk_size (int): The number of elements per chunk.
         target_tag (str): The tag name to split on.
-        pattern (str): File pattern to match when processing directories.
+        pattern (str): File pattern to match when processing directories and ZIP files.
         recursive (bool): Whether to search subdirectories recursively.
+        workers (int): Number of processes used to split multiple files to disk.
+        pretty_print (bool): Whether to indent the elements in chunk files.
+        writer_threads (int): Number of threads writing chunk files in the background.
+        trust_zip (bool): Whether ZIP members are parsed without checking their CRC first.
     """
 
     def __init__(
         self,
-        target_tag: str,
+        target_tag: Union[str, Tuple[str, str]],
         chunk_size: int = 1000,
         pattern: str = "*.xml",
         recursive: bool = False,
+        workers: int = 1,
+        pretty_print: bool = False,
+        writer_threads: int = 0,
+        trust_zip: bool = True,
     ) -> None:
         """
         Initialize the XMLSplitter.
 
         Args:
-            target_tag: The XML tag to use as split points.
+            target_tag: The XML tag to use as split points, either a name such as
+                "{namespace}local" or a tuple (namespace, local).
             chunk_size: Number of elements per chunk. Defaults to 1000.
-            pattern: File pattern to match when processing directories. Defaults to "*.xml".
+            pattern: File pattern to match when processing directories and ZIP files.
+                Defaults to "*.xml".
             recursive: If True, search subdirectories recursively. Defaults to False.
+            workers: Number of processes used to split multiple files into an
+                output directory. Defaults to 1.
+            pretty_print: If True, indent the elements in chunk files. Defaults to False.
+            writer_threads: If above 0, chunk files are serialized in memory and written
+                by this many threads while parsing continues. Defaults to 0.
+            trust_zip: If False, every matched ZIP member is read through and its CRC
+                checked before any is parsed, so a corrupt archive fails up front.
+                Defaults to True.
         """
-        self.target_tag = target_tag
+        # Build the Clark notation name once instead of per parse
+        if isinstance(target_tag, tuple):
+            namespace, local = target_tag
+            target_tag = f"{{{namespace}}}{local}"
+
+        self.target_tag = sys.intern(target_tag)
         self.chunk_size = chunk_size
         self.pattern = pattern
         self.recursive = recursive
+        self.workers = workers
+        self.pretty_print = pretty_print
+        self.writer_threads = writer_threads
+        self.trust_zip = trust_zip
 
     def split_file(
         self, filepath: Union[str, Path], output_dir: Optional[Union[str, Path]] = None
@@ -50,9 +337,15 @@ class XMLSplitter:
         """
         Split XML file(s) into chunks based on the target tag.
 
+        When chunks are written to output_dir, workers is above 1 and there are
+        several XML sources, each source is split in its own worker process.
+        If output_dir ends with ".zip", all chunk files are instead written as
+        compressed members of that single ZIP file.
+
         Args:
             filepath: Path to XML file, directory containing XML files, or ZIP file.
-            output_dir: Optional directory to write chunk files. If None, yields elements.
+            output_dir: Optional directory or ZIP file to write chunk files. If None,
+                yields elements.
 
         Yields:
             XML elements for each chunk.
@@ -61,26 +354,182 @@ class XMLSplitter:
             FileNotFoundError: If the file or directory does not exist.
             ValueError: If directory/ZIP contains no XML files.
         """
-        filepath = Path(filepath)
-        if not filepath.exists():
-            raise FileNotFoundError(f"Path not found: {filepath}")
+        xml_sources = self._get_xml_sources(filepath)
+
+        if output_dir and os.fspath(output_dir).lower().endswith(".zip"):
+            self._split_to_zip(xml_sources, output_dir)
+            return
+
+        if output_dir and self.workers > 1 and len(xml_sources) > 1:
+            self._split_parallel(xml_sources, output_dir)
+            return
+
+        if output_dir and self.writer_threads > 0:
+            self._split_threaded(xml_sources, output_dir)
+            return
 
-        chunk = []
         chunk_num = 0
 
+        for chunk in self._iter_chunks(xml_sources):
+            if output_dir:
+                self._write_chunk(chunk, output_dir, chunk_num)
+            else:
+                yield self._create_chunk_tree(chunk)
+
+            chunk_num += 1
+
+    def stream_parse(
+        self,
+        filepath: Union[str, Path],
+        entity_parser: EntityParser,
+        batch_size: int = 10_000,
+        **kwargs: Any,
+    ) -> Iterator[DataFrameLike]:
+        """
+        Split XML file(s) and parse the target elements in a single pass.
+
+        Each target element goes straight from the parser into the entity
+        parser's column buffers and is cleared right after, so no chunk trees
+        are built and nothing is walked twice. Elements are selected by the
+        entity parser's target_tag, or by this splitter's target tag if it has
+        none.
+
+        Args:
+            filepath: Path to XML file, directory containing XML files, or ZIP file.
+            entity_parser: The entity parser to apply to each target element.
+            batch_size: Number of rows per DataFrame. Defaults to 10000.
+            **kwargs: Additional arguments for the DataFrame constructor.
+
+        Returns:
+            Iterator over DataFrames with up to batch_size rows each.
+
+        Raises:
+            FileNotFoundError: If the file or directory does not exist.
+            ValueError: If directory/ZIP contains no XML files.
+        """
+        xml_sources = self._get_xml_sources(filepath)
+        tag = entity_parser.target_tag or self.target_tag
+
+        return entity_parser.iter_parse(self._iter_released(xml_sources, tag), batch_size, **kwargs)
+
+    def split_file_sax(self, filepath: Union[str, Path], output_dir: Union[str, Path]) -> int:
+        """
+        Split XML file(s) into chunk files without building any element objects.
+
+        This is a streaming fast path for :meth:`split_file` with an output
+        directory. Target elements are copied from the expat event stream
+        straight into the chunk files, so memory use stays flat regardless of
+        the input size. Nested target elements stay inside their outermost
+        target. Target tags are matched in Clark notation as in split_file,
+        and the namespaces in scope are declared on each copied target element.
+
+        Args:
+            filepath: Path to XML file, directory containing XML files, or ZIP file.
+            output_dir: Directory to write chunk files.
+
+        Returns:
+            Number of chunk files written.
+
+        Raises:
+            FileNotFoundError: If the file or directory does not exist.
+            ValueError: If directory/ZIP contains no XML files.
+            xml.parsers.expat.ExpatError: If an input document is malformed.
+        """
+        xml_sources = self._get_xml_sources(filepath)
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        writer = _SAXChunkWriter(self.target_tag, self.chunk_size, output_dir)
+
+        for source in self._open_sources(xml_sources):
+            if isinstance(source, str):
+                with open(source, "rb") as xml_file:
+                    writer.feed(xml_file)
+            else:
+                writer.feed(source)
+
+        writer.close()
+        return writer.chunk_num
+
+    def map_parse(
+        self,
+        filepath: Union[str, Path],
+        entity_parser: EntityParser,
+        workers: Optional[int] = None,
+        **kwargs: Any,
+    ) -> DataFrameLike:
+        """
+        Split XML file(s) and parse the chunks in parallel worker processes.
+
+        Chunks are serialized to bytes, since lxml elements cannot be pickled,
+        and parsed by copies of ``entity_parser`` in a process pool. At most
+        two chunks per worker are in flight, so memory stays bounded as with
+        :meth:`split_file`. The DataFrames must be picklable, which rules out
+        PySpark.
+
+        Args:
+            filepath: Path to XML file, directory containing XML files, or ZIP file.
+            entity_parser: The entity parser to apply to each chunk.
+            workers: Number of worker processes. Defaults to the CPU count.
+            **kwargs: Additional arguments for EntityParser.parse.
+
+        Returns:
+            DataFrame with the entities of all chunks, in document order.
+
+        Raises:
+            FileNotFoundError: If the file or directory does not exist.
+            ValueError: If directory/ZIP contains no XML files.
+        """
+        workers = workers or os.cpu_count() or 1
+        frames = []
+        pending: deque = deque()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in self.split_file(filepath):
+                data = etree.tostring(chunk)
+                pending.append(executor.submit(_parse_chunk_bytes, data, entity_parser, kwargs))
+
+                if len(pending) >= 2 * workers:
+                    frames.append(pending.popleft().result())
+
+            while pending:
+                frames.append(pending.popleft().result())
+
+        return concat_dataframes(frames, entity_parser.preferred_library)
+
+    def _get_xml_sources(self, filepath: Union[str, Path]) -> list:
+        """
+        Resolve a file, directory or ZIP path into the XML sources to process.
+
+        Args:
+            filepath: Path to XML file, directory containing XML files, or ZIP file.
+
+        Returns:
+            List of tuples (xml_source, zip_path_or_none).
+
+        Raises:
+            FileNotFoundError: If the file or directory does not exist.
+            ValueError: If directory/ZIP contains no XML files.
+        """
+        filepath = Path(filepath)
+
+        # One stat call gives both existence and type
+        try:
+            mode = os.stat(filepath).st_mode
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Path not found: {filepath}")
+
         # Determine source type and get XML sources
-        if filepath.is_file() and filepath.suffix.lower() == ".zip":
+        if stat.S_ISREG(mode) and filepath.suffix.lower() == ".zip":
             # Handle ZIP file
             xml_sources = self._get_zip_xml_sources(filepath)
-        elif filepath.is_file():
+        elif stat.S_ISREG(mode):
             # Single XML file
             xml_sources = [(filepath, None)]
-        elif filepath.is_dir():
+        elif stat.S_ISDIR(mode):
             # Directory with XML files
-            if self.recursive:
-                xml_files = list(filepath.rglob(self.pattern))
-            else:
-                xml_files = list(filepath.glob(self.pattern))
+            xml_files = list(self._iter_matching_files(filepath))
 
             if not xml_files:
                 search_type = "recursively" if self.recursive else "in directory"
@@ -92,57 +541,47 @@ class XMLSplitter:
         else:
             raise ValueError(f"Invalid path: {filepath}")
 
-        # Process all XML sources
-        for xml_source, zip_path_or_none in xml_sources:
-            logger.info(f"Processing: {xml_source}")
-
-            if zip_path_or_none:
-                # Stream from ZIP file - open fresh each time
-                with zipfile.ZipFile(zip_path_or_none, "r") as zip_ref:
-                    with zip_ref.open(str(xml_source)) as xml_file:
-                        context = etree.iterparse(xml_file, events=("end",), tag=self.target_tag)
-                        for event, element in context:
-                            chunk.append(element)
-
-                            if len(chunk) >= self.chunk_size:
-                                if output_dir:
-                                    self._write_chunk(chunk, output_dir, chunk_num)
-                                else:
-                                    yield self._create_chunk_tree(chunk)
-
-                                chunk = []
-                                chunk_num += 1
-
-                            # Clear element to free memory
-                            element.clear()
-                            while element.getprevious() is not None:
-                                del element.getparent()[0]
-            else:
-                # Regular file
-                context = etree.iterparse(str(xml_source), events=("end",), tag=self.target_tag)
-                for event, element in context:
-                    chunk.append(element)
+        return xml_sources
 
-                    if len(chunk) >= self.chunk_size:
-                        if output_dir:
-                            self._write_chunk(chunk, output_dir, chunk_num)
-                        else:
-                            yield self._create_chunk_tree(chunk)
+    def _iter_matching_files(self, root: Path) -> Iterator[str]:
+        """
+        Walk a directory and yield the files whose names match the pattern.
 
-                        chunk = []
-                        chunk_num += 1
+        Entries come from os.scandir, whose type information is read along
+        with the directory listing, so files are not stat'ed one by one.
+        Symlinked directories are not followed. Patterns with directory parts,
+        such as "sub/*.xml" or "**/*.xml", are matched by Path.glob instead.
 
-                    # Clear element to free memory
-                    element.clear()
-                    while element.getprevious() is not None:
-                        del element.getparent()[0]
+        Args:
+            root: Directory to search.
 
-        # Handle remaining elements
-        if chunk:
-            if output_dir:
-                self._write_chunk(chunk, output_dir, chunk_num)
-            else:
-                yield self._create_chunk_tree(chunk)
+        Yields:
+            Paths of the matching files.
+        """
+        pattern = self.pattern
+        if "/" in pattern or os.sep in pattern:
+            paths = root.rglob(pattern) if self.recursive else root.glob(pattern)
+            for path in paths:
+                if path.is_file():
+                    yield os.fspath(path)
+            return
+
+        # File names are matched like glob does, case-insensitively on Windows.
+        # "*.xml" style patterns are a plain suffix test, no regex needed
+        match = _compile_glob(pattern, os.name == "nt").match
+        suffix = _literal_suffix(pattern) if os.name != "nt" else None
+        stack = [os.fspath(root)]
+
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            stack.append(entry.path)
+                    elif (
+                        entry.name.endswith(suffix) if suffix else match(entry.name)
+                    ) and entry.is_file():
+                        yield entry.path
 
     def _get_zip_xml_sources(self, zip_path: Path) -> list:
         """
@@ -153,16 +592,31 @@ class XMLSplitter:
 
         Returns:
             List of tuples (xml_filename, zip_path) for deferred opening.
+
+        Raises:
+            ValueError: If the ZIP file is invalid, has a corrupt member or has no XML files.
         """
         try:
+            # Member names are matched regardless of case, as archives are
+            # often created on case-insensitive file systems
+            match = _compile_glob(self.pattern, True).match
+
             # Just check if ZIP is valid and find XML files
             with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                # Skip directories, __MACOSX/ metadata and hidden files such
+                # as the ._name.xml resource forks macOS adds to archives
                 xml_files = [
-                    name
-                    for name in zip_ref.namelist()
-                    if name.lower().endswith(".xml") and not name.startswith("__")
+                    info.filename
+                    for info in zip_ref.infolist()
+                    if not info.is_dir()
+                    and not info.filename.startswith("__")
+                    and (name := info.filename.rpartition("/")[2])[:1] != "."
+                    and match(name)
                 ]
 
+                if not self.trust_zip:
+                    self._check_zip_members(zip_ref, xml_files)
+
             if not xml_files:
                 raise ValueError(f"No XML files found in ZIP: {zip_path}")
 
@@ -172,6 +626,222 @@ class XMLSplitter:
         except zipfile.BadZipFile:
             raise ValueError(f"Invalid ZIP file: {zip_path}")
 
+    def _check_zip_members(self, zip_ref: zipfile.ZipFile, names: List[str]) -> None:
+        """
+        Decompress ZIP members without keeping the data, checking their CRC.
+
+        Args:
+            zip_ref: The open ZIP file.
+            names: Names of the members to check.
+
+        Raises:
+            ValueError: If a member is corrupt.
+        """
+        for name in names:
+            try:
+                # The CRC is compared when the end of the member is read
+                with zip_ref.open(name) as f:
+                    while f.read(_ZIP_CHECK_SIZE):
+                        pass
+            except (zipfile.BadZipFile, zlib.error):
+                raise ValueError(f"Invalid ZIP file: corrupt entry {name} in {zip_ref.filename}")
+
+    def _iter_chunks(self, xml_sources: list) -> Iterator[list]:
+        """
+        Group the target elements from all XML sources into chunks.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+
+        Yields:
+            Lists of up to chunk_size elements, detached from the source tree.
+        """
+        # Grow the list by append, so memory follows the elements actually read
+        # rather than chunk_size
+        chunk_size = self.chunk_size
+        chunk: list = []
+
+        for element in self._iter_elements(xml_sources, self.target_tag):
+            chunk.append(element)
+            # Free everything parsed before it, including non-target content
+            self._drop_preceding(element)
+
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        # Handle remaining elements
+        if chunk:
+            yield chunk
+
+    def _split_parallel(self, xml_sources: list, output_dir: Union[str, Path]) -> None:
+        """
+        Split each XML source in its own worker process.
+
+        Every worker writes the chunks of one source into a private directory,
+        so no file names are shared between processes. The chunk files are then
+        renamed into output_dir in source order. Unlike the serial path, a chunk
+        never holds elements of more than one source.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+            output_dir: Directory to write chunk files.
+        """
+        output_dir = Path(output_dir)
+        part_dirs = [output_dir / f".part_{i:04d}" for i in range(len(xml_sources))]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            counts = list(executor.map(_split_source, repeat(self), xml_sources, part_dirs))
+
+        chunk_num = 0
+
+        for part_dir, count in zip(part_dirs, counts):
+            for part_num in range(count):
+                os.replace(
+                    part_dir / f"chunk_{part_num:04d}.xml",
+                    output_dir / f"chunk_{chunk_num:04d}.xml",
+                )
+                chunk_num += 1
+
+            if count:
+                part_dir.rmdir()
+
+    def _split_threaded(self, xml_sources: list, output_dir: Union[str, Path]) -> None:
+        """
+        Write chunk files from a thread pool while the next chunks are parsed.
+
+        Each chunk is serialized to bytes in the calling thread and written by
+        a pool thread, which releases the GIL during the write. At most two
+        chunks per thread wait to be written.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+            output_dir: Directory to write chunk files.
+        """
+        pending: deque = deque()
+
+        with ThreadPoolExecutor(max_workers=self.writer_threads) as pool:
+            for chunk_num, chunk in enumerate(self._iter_chunks(xml_sources)):
+                buffer = io.BytesIO()
+                self._write_elements(buffer, chunk)
+                pending.append(
+                    pool.submit(self._write_chunk_data, buffer.getvalue(), output_dir, chunk_num)
+                )
+
+                if len(pending) >= 2 * self.writer_threads:
+                    pending.popleft().result()
+
+            while pending:
+                pending.popleft().result()
+
+    def _split_to_zip(self, xml_sources: list, zip_path: Union[str, Path]) -> None:
+        """
+        Write all chunks as members of a single ZIP file.
+
+        Each chunk is streamed into its compressed member, so no chunk file is
+        written to disk on its own.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+            zip_path: Path of the ZIP file to create.
+        """
+        zip_path = Path(zip_path)
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with zipfile.ZipFile(
+            zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=_ZIP_COMPRESSLEVEL
+        ) as zip_ref:
+            for chunk_num, chunk in enumerate(self._iter_chunks(xml_sources)):
+                member = f"chunk_{chunk_num:04d}.xml"
+                with zip_ref.open(member, "w", force_zip64=True) as output_file:
+                    self._write_elements(output_file, chunk)
+
+    def _iter_elements(self, xml_sources: list, tag: str) -> Iterator[etree._Element]:
+        """
+        Yield the elements with a tag from all XML sources in document order.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+            tag: The tag of the elements to yield.
+
+        Yields:
+            Each matching element once it has been parsed completely.
+        """
+        for source in self._open_sources(xml_sources):
+            for event, element in etree.iterparse(source, tag=tag, **_ITERPARSE_OPTIONS):
+                yield element
+
+    def _open_sources(self, xml_sources: list) -> Iterator[Union[str, IO[bytes]]]:
+        """
+        Open the XML sources one after another.
+
+        Consecutive members of the same ZIP file are read through one open
+        ZipFile, which is closed once its last member is done.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+
+        Yields:
+            An open binary file for each ZIP member, valid until the next
+            source is requested, or the path of each regular file.
+        """
+        for zip_path_or_none, group in groupby(xml_sources, key=itemgetter(1)):
+            if not zip_path_or_none:
+                for xml_source, _ in group:
+                    logger.info("Processing: %s", xml_source)
+                    yield os.fspath(xml_source)
+                continue
+
+            with zipfile.ZipFile(zip_path_or_none, "r") as zip_ref:
+                for xml_source, _ in group:
+                    logger.info("Processing: %s", xml_source)
+                    with zip_ref.open(xml_source) as xml_file:
+                        yield xml_file
+
+    def _iter_released(self, xml_sources: list, tag: str) -> Iterator[etree._Element]:
+        """
+        Yield matching elements and free each one once the consumer is done.
+
+        When the next element is requested, the previous one is cleared and
+        everything parsed before it is dropped.
+
+        Args:
+            xml_sources: List of tuples (xml_source, zip_path_or_none).
+            tag: The tag of the elements to yield.
+
+        Yields:
+            Each matching element once it has been parsed completely.
+        """
+        for element in self._iter_elements(xml_sources, tag):
+            yield element
+            # lxml-stubs do not know the keep_tail argument
+            element.clear(keep_tail=True)  # type: ignore[call-arg]
+            self._drop_preceding(element)
+
+    @staticmethod
+    def _drop_preceding(element: etree._Element) -> None:
+        """
+        Remove everything parsed before an element from its source tree.
+
+        Called after every target element, so non-target content between sparse
+        targets is not kept. For the element and each of its ancestors, all
+        preceding siblings are deleted with a single slice, which only holds
+        what was parsed since the last call. Ancestors are still open in the
+        parser, so they are kept.
+        Buffered chunk elements are still referenced, so lxml moves them out
+        with their content intact instead of freeing them.
+
+        Args:
+            element: The most recently parsed target element.
+        """
+        node = element
+        parent = node.getparent()
+
+        while parent is not None:
+            del parent[: parent.index(node)]
+            node = parent
+            parent = node.getparent()
+
     def _create_chunk_tree(self, elements: list) -> etree._Element:
         """
         Create an XML tree from a list of elements.
@@ -198,11 +868,50 @@ class XMLSplitter:
             output_dir: Directory to write the chunk file.
             chunk_num: Chunk number for filename.
         """
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = os.path.join(output_dir, f"chunk_{chunk_num:04d}.xml")
 
-        root = self._create_chunk_tree(elements)
-        tree = etree.ElementTree(root)
+        try:
+            self._write_elements(output_file, elements)
+        except FileNotFoundError:
+            # Create the directory on the first chunk instead of probing it for every chunk
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            self._write_elements(output_file, elements)
 
-        output_file = output_dir / f"chunk_{chunk_num:04d}.xml"
-        tree.write(str(output_file), encoding="utf-8", xml_declaration=True, pretty_print=True)
+    def _write_chunk_data(self, data: bytes, output_dir: Union[str, Path], chunk_num: int) -> None:
+        """
+        Write a serialized chunk to a file.
+
+        Args:
+            data: The serialized chunk document.
+            output_dir: Directory to write the chunk file.
+            chunk_num: Chunk number for filename.
+        """
+        output_file = os.path.join(output_dir, f"chunk_{chunk_num:04d}.xml")
+
+        try:
+            f = open(output_file, "wb")
+        except FileNotFoundError:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            f = open(output_file, "wb")
+
+        with f:
+            f.write(data)
+
+    def _write_elements(self, output_file: Union[str, IO[bytes]], elements: list) -> None:
+        """
+        Write elements as a <chunk> document.
+
+        Args:
+            output_file: Path or binary file object to write to.
+            elements: List of XML elements.
+        """
+        pretty_print = self.pretty_print
+
+        # Stream the elements out instead of building a <chunk> tree first
+        with etree.xmlfile(output_file, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element("chunk"):
+                if pretty_print:
+                    xf.write("\n")
+                for elem in elements:
+                    xf.write(elem, pretty_print=pretty_print)
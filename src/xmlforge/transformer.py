@@ -2,13 +2,38 @@
 XML Transformer module for transforming XML documents.
 """
 
-import uuid
+import copy
+import functools
+import os
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 
 from lxml import etree
 
 
+@functools.lru_cache(maxsize=32)
+def _compile_xslt(path: str, mtime_ns: int) -> etree.XSLT:
+    """
+    Parse and compile an XSLT stylesheet, cached per path and modification time.
+
+    Args:
+        path: Path to the XSLT stylesheet file.
+        mtime_ns: Modification time of the file, so edited stylesheets are recompiled.
+
+    Returns:
+        The compiled XSLT transformation.
+    """
+    # lxml's default parser loads no external DTDs or network resources
+    return etree.XSLT(etree.parse(path))
+
+
+@functools.lru_cache(maxsize=256)
+def _strparam(value: str) -> Any:
+    """Quote a string XSLT parameter, reusing the result for repeated values."""
+    return etree.XSLT.strparam(value)
+
+
 class XMLTransformer:
     """
     A class for transforming XML documents using XSLT or custom transformations.
@@ -38,15 +63,20 @@ class XMLTransformer:
         Raises:
             FileNotFoundError: If the XSLT file does not exist.
         """
-        if not self.xslt_file or not self.xslt_file.exists():
+        if not self.xslt_file:
+            raise FileNotFoundError(f"XSLT file not found: {self.xslt_file}")
+
+        path = os.fspath(self.xslt_file)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"XSLT file not found: {self.xslt_file}")
 
-        xslt_doc = etree.parse(str(self.xslt_file))
-        self.transform = etree.XSLT(xslt_doc)
+        self.transform = _compile_xslt(path, mtime_ns)
 
     def transform_file_with_xslt(
         self,
-        input_file: Union[str, Path],
+        input_file: Union[str, Path, etree._ElementTree],
         output_file: Optional[Union[str, Path]] = None,
         **params: str,
     ) -> etree._ElementTree:
@@ -54,7 +84,7 @@ class XMLTransformer:
         Transform an XML file using the loaded XSLT stylesheet.
 
         Args:
-            input_file: Path to the input XML file.
+            input_file: Path to the input XML file, or an already parsed tree.
             output_file: Optional path to write the transformed XML.
             **params: Additional parameters to pass to the XSLT transformation.
 
@@ -68,17 +98,16 @@ class XMLTransformer:
         if not self.transform:
             raise ValueError("No XSLT stylesheet loaded")
 
-        input_file = Path(input_file)
-        if not input_file.exists():
-            raise FileNotFoundError(f"Input file not found: {input_file}")
-
-        doc = etree.parse(str(input_file))
-        # Convert string params to proper XSLT parameters
-        if params:
-            xslt_params = {k: etree.XSLT.strparam(v) for k, v in params.items()}
-            result = self.transform(doc, **xslt_params)  # type: ignore[arg-type]
+        if isinstance(input_file, etree._ElementTree):
+            doc = input_file
         else:
-            result = self.transform(doc)
+            input_file = Path(input_file)
+            if not input_file.exists():
+                raise FileNotFoundError(f"Input file not found: {input_file}")
+
+            doc = etree.parse(str(input_file))
+
+        result = self.transform(doc, **self._xslt_params(params))
 
         if output_file:
             result.write(str(output_file), encoding="utf-8", xml_declaration=True)
@@ -98,18 +127,49 @@ class XMLTransformer:
         Returns:
             The transformed XML as an ElementTree.
 
+        Raises:
+            ValueError: If no XSLT stylesheet is loaded.
+        """
+        return self.transform_many([element], **params)[0]
+
+    def transform_many(
+        self, elements: Iterable[etree._Element], **params: str
+    ) -> List[etree._ElementTree]:
+        """
+        Transform several XML elements using the loaded XSLT stylesheet.
+
+        The parameters are converted once and reused for every element.
+
+        Args:
+            elements: The XML elements to transform.
+            **params: Additional parameters to pass to the XSLT transformation.
+
+        Returns:
+            The transformed XML of each element as an ElementTree.
+
         Raises:
             ValueError: If no XSLT stylesheet is loaded.
         """
         if not self.transform:
             raise ValueError("No XSLT stylesheet loaded")
 
-        # Convert string params to proper XSLT parameters
-        if params:
-            xslt_params = {k: etree.XSLT.strparam(v) for k, v in params.items()}
-            return self.transform(element, **xslt_params)  # type: ignore[arg-type]
-        else:
-            return self.transform(element)
+        transform = self.transform
+        xslt_params = self._xslt_params(params)
+
+        return [transform(element, **xslt_params) for element in elements]
+
+    @staticmethod
+    def _xslt_params(params: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Convert string params to proper XSLT parameters.
+
+        Args:
+            params: Parameter names and string values.
+
+        Returns:
+            Parameters quoted as XSLT string literals.
+        """
+        return {k: _strparam(v) for k, v in params.items()}
 
     def add_namespace(
         self, element: etree._Element, namespace: str, prefix: Optional[str] = None
@@ -120,28 +180,21 @@ class XMLTransformer:
         Args:
             element: The XML element to modify.
             namespace: The namespace URI.
-            prefix: Optional namespace prefix.
+            prefix: Optional namespace prefix. If None, the default namespace is set.
 
         Returns:
             The modified element.
         """
-        # Handle nsmap - filter out None keys
-        nsmap: Dict[str, str] = {}
-        if element.nsmap:
-            nsmap = {k: v for k, v in element.nsmap.items() if k is not None}
-        nsmap[prefix or ""] = namespace
-
-        # Convert attrib to proper string dict
-        attrib_dict: Dict[str, str] = {}
-        if element.attrib is not None:
-            attrib_dict = {str(k): str(v) for k, v in element.attrib.items()}
-
-        new_element = etree.Element(element.tag, nsmap=nsmap, attrib=attrib_dict)
+        # Keep the prefixed namespaces, None is the default namespace
+        nsmap: Dict[Optional[str], str] = {k: v for k, v in element.nsmap.items() if k}
+        nsmap[prefix or None] = namespace
+
+        # lxml-stubs do not allow the None key of the default namespace
+        new_element = etree.Element(element.tag, nsmap=cast(Dict[str, str], nsmap))
+        new_element.attrib.update(element.attrib)
         new_element.text = element.text
         new_element.tail = element.tail
-
-        for child in element:
-            new_element.append(child)
+        new_element.extend(element)
 
         return new_element
 
@@ -156,8 +209,10 @@ class XMLTransformer:
             The modified element without namespaces.
         """
         for elem in element.iter():
-            if isinstance(elem.tag, str):
-                elem.tag = etree.QName(elem).localname
+            tag = elem.tag
+            # Only rename namespaced elements, splitting "{uri}local" in place
+            if isinstance(tag, str) and tag[:1] == "{":
+                elem.tag = tag[tag.rfind("}") + 1 :]
 
         etree.cleanup_namespaces(element)
         return element
@@ -180,59 +235,94 @@ class XMLTransformer:
             parent_attr: Attribute name for parent references (default: "parent_id").
 
         Returns:
-            List of flattened elements with same tag name.
+            List of flattened elements with same tag name, the root first. Each
+            other element follows the elements flattened out of it.
+        """
+        return list(self.iter_flatten(element, target_tag, id_attr, parent_attr))
+
+    def iter_flatten(
+        self,
+        element: etree._Element,
+        target_tag: str,
+        id_attr: str = "id",
+        parent_attr: str = "parent_id",
+    ) -> Iterator[etree._Element]:
+        """
+        Flatten nested same-tag elements like flatten_hierarchy, one element at a time.
+
+        The IDs are assigned on the input and the copy is flattened before this
+        returns. The flattened elements are removed from their parents but still
+        share the copy's document; the returned iterator drops its reference to each
+        element once it is yielded, so a consumer writing the elements out lets them
+        be freed one by one instead of holding all of them.
+
+        Args:
+            element: The root element to process.
+            target_tag: The tag name to flatten (only same-tag nesting).
+            id_attr: Attribute name for unique IDs (default: "id").
+            parent_attr: Attribute name for parent references (default: "parent_id").
+
+        Returns:
+            An iterator over the flattened elements with same tag name, the root
+            first. Each other element follows the elements flattened out of it.
         """
-        result = []
-
-        def _flatten_recursive(
-            elem: etree._Element, parent_id: Optional[str] = None
-        ) -> etree._Element:
-            # Generate or use existing ID for target elements
-            if elem.tag == target_tag:
-                elem_id = elem.get(id_attr)
-                if not elem_id:
-                    elem_id = str(uuid.uuid4())[:8]
-                    elem.set(id_attr, elem_id)
-            else:
-                elem_id = None
-
-            # Create copy of current element
-            attrib_dict = {str(k): str(v) for k, v in elem.attrib.items()}
-            new_elem = etree.Element(elem.tag, attrib=attrib_dict)
-            new_elem.text = elem.text
-            new_elem.tail = elem.tail
-
-            # Set parent reference if this is a target element with a parent
-            if parent_id and elem.tag == target_tag:
-                new_elem.set(parent_attr, parent_id)
-
-            # Collect children to be flattened (same tag nesting)
-            children_to_flatten = []
-
-            # Process children
-            for child in elem:
-                if child.tag == target_tag and elem.tag == target_tag:
-                    # Same tag nesting detected - collect for flattening
-                    children_to_flatten.append(child)
-                else:
-                    # Different tag or not target tag - keep in hierarchy
-                    processed_child = _flatten_recursive(
-                        child, elem_id if elem.tag == target_tag else parent_id
-                    )
-                    new_elem.append(processed_child)
-
-            # Process children to flatten in order
-            for child in children_to_flatten:
-                flattened_child = _flatten_recursive(child, elem_id)
-                result.append(flattened_child)
-
-            return new_elem
-
-        # Process root element
-        root_copy = _flatten_recursive(element)
-
-        # Return root first, then flattened children in order
-        return [root_copy] + result
+        # Give every target element an ID, on the original as before
+        for elem in element.iter(target_tag):
+            if not elem.get(id_attr):
+                elem.set(id_attr, os.urandom(4).hex())
+
+        # Copy the whole tree in C, then only visit the target elements
+        root_copy = copy.deepcopy(element)
+        # Target elements below each target: kept in place inside other tags,
+        # or cut out as same tag nesting
+        kept: Dict[etree._Element, List[etree._Element]] = {}
+        cut: Dict[etree._Element, List[etree._Element]] = {}
+
+        for elem in root_copy.iter(target_tag):
+            # Reference the nearest target ancestor, even across other tags
+            ancestor = next(elem.iterancestors(target_tag), None)
+            if ancestor is None:
+                # Top level targets below a root of another tag are only kept
+                if elem is not root_copy:
+                    kept.setdefault(root_copy, []).append(elem)
+                continue
+
+            # Every target was given an ID above
+            elem.set(parent_attr, cast(str, ancestor.get(id_attr)))
+
+            # Same tag nesting is cut out into its own element, keeping its tail
+            group = cut if elem.getparent() is ancestor else kept
+            group.setdefault(ancestor, []).append(elem)
+
+        # Order the cut out elements depth first: an element's kept targets are
+        # visited before its cut out children, and each cut out element follows
+        # its own descendants. None marks an element whose descendants are done.
+        nested: deque = deque()
+        stack: List[Tuple[etree._Element, Optional[bool]]] = [(root_copy, False)]
+
+        while stack:
+            elem, is_cut = stack.pop()
+            if is_cut is None:
+                nested.append(elem)
+                continue
+
+            if is_cut:
+                stack.append((elem, None))
+            stack.extend((child, True) for child in reversed(cut.get(elem, ())))
+            stack.extend((child, False) for child in reversed(kept.get(elem, ())))
+
+        # Cut out only after the walk, removing during iter() would end it early
+        for elem in nested:
+            elem.getparent().remove(elem)
+
+        nested.appendleft(root_copy)
+        return self._iter_popped(nested)
+
+    @staticmethod
+    def _iter_popped(elements: deque) -> Iterator[etree._Element]:
+        """Yield elements from the front of a deque, dropping each from it."""
+        while elements:
+            yield elements.popleft()
 
     def rebuild_hierarchy(
         self,
@@ -253,21 +343,23 @@ class XMLTransformer:
         Returns:
             The root element of the rebuilt hierarchy.
         """
-        elem_dict = {elem.get(id_attr): elem for elem in elements if elem.get(id_attr)}
-        root = None
-
-        for elem in elements:
-            parent_id = elem.get(parent_attr)
-            if parent_id and parent_id in elem_dict:
-                parent_elem = elem_dict[parent_id]
-                parent_elem.append(elem)
-            elif not parent_id and elem.tag == target_tag:
+        # Read each attribute once into parallel lists, then link in a second pass
+        ids = [elem.get(id_attr) for elem in elements]
+        parent_ids = [elem.get(parent_attr) for elem in elements]
+        elem_dict = {elem_id: elem for elem_id, elem in zip(ids, elements) if elem_id}
+
+        root = etree.Element("root")
+
+        for elem, parent_id in zip(elements, parent_ids):
+            if parent_id:
+                parent_elem = elem_dict.get(parent_id)
+                if parent_elem is not None:
+                    parent_elem.append(elem)
+            elif elem.tag == target_tag:
                 # This is a top-level element
-                if root is None:
-                    root = etree.Element("root")
                 root.append(elem)
 
-        if root is None:
+        if not len(root):
             raise ValueError("No top-level element found to serve as root.")
 
         return root
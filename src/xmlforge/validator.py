@@ -2,11 +2,15 @@
 XML Validator module for validating XML documents.
 """
 
+import os
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Tuple, Union, cast
 
 from lxml import etree
 
+# Read size when feeding files to the well-formedness parser
+_FEED_SIZE = 1 << 16
+
 
 class ValidationError(Exception):
     """Exception raised when XML validation fails."""
@@ -14,6 +18,42 @@ class ValidationError(Exception):
     pass
 
 
+def _well_formed_parser() -> etree.XMLPullParser:
+    """
+    Create a parser that only checks syntax.
+
+    A pull parser reports namespace errors such as undeclared prefixes like
+    the tree parsers do, which a parser target without start() callbacks does
+    not. huge_tree lifts libxml2's depth and text size limits, which would
+    otherwise report large but well-formed documents as malformed.
+
+    Expat would be faster, but it cannot read multi-byte encodings such as
+    Shift_JIS that libxml2 and the other parsers in this package accept.
+
+    Returns:
+        A feed parser reporting element end events.
+    """
+    return etree.XMLPullParser(events=("end",), huge_tree=True)
+
+
+def _discard_parsed(parser: etree.XMLPullParser) -> None:
+    """
+    Free the elements parsed so far, keeping only their empty ancestors.
+
+    Args:
+        parser: The pull parser to read events from.
+    """
+    for _, item in parser.read_events():
+        # "end" events only carry elements
+        element = cast(etree._Element, item)
+        element.clear()
+        # Remove the finished previous siblings so the tree does not grow
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
 class XMLValidator:
     """
     A class for validating XML documents against schemas.
@@ -23,7 +63,8 @@ class XMLValidator:
 
     def __init__(self) -> None:
         """Initialize the XMLValidator."""
-        pass
+        # Compiled schemas by (schema type, path), with the file's mtime
+        self._schemas: Dict[Tuple[type, str], Tuple[int, Any]] = {}
 
     def validate_with_xsd(self, xml_file: Union[str, Path], xsd_file: Union[str, Path]) -> bool:
         """
@@ -40,18 +81,11 @@ class XMLValidator:
             ValidationError: If validation fails.
             FileNotFoundError: If any file does not exist.
         """
-        xml_file = Path(xml_file)
-        xsd_file = Path(xsd_file)
-
-        if not xml_file.exists():
-            raise FileNotFoundError(f"XML file not found: {xml_file}")
-        if not xsd_file.exists():
-            raise FileNotFoundError(f"XSD file not found: {xsd_file}")
+        xml_path = self._stat_file(xml_file, "XML")[0]
+        schema = self._load_schema(etree.XMLSchema, xsd_file, "XSD")
 
-        schema_doc = etree.parse(str(xsd_file))
-        schema = etree.XMLSchema(schema_doc)
-
-        xml_doc = etree.parse(str(xml_file))
+        # lxml's default parser loads no external DTDs or network resources
+        xml_doc = etree.parse(xml_path)
 
         if not schema.validate(xml_doc):
             errors = self._format_errors(schema.error_log)
@@ -74,16 +108,10 @@ class XMLValidator:
             ValidationError: If validation fails.
             FileNotFoundError: If any file does not exist.
         """
-        xml_file = Path(xml_file)
-        dtd_file = Path(dtd_file)
-
-        if not xml_file.exists():
-            raise FileNotFoundError(f"XML file not found: {xml_file}")
-        if not dtd_file.exists():
-            raise FileNotFoundError(f"DTD file not found: {dtd_file}")
+        xml_path = self._stat_file(xml_file, "XML")[0]
+        dtd = self._load_schema(etree.DTD, dtd_file, "DTD")
 
-        dtd = etree.DTD(str(dtd_file))
-        xml_doc = etree.parse(str(xml_file))
+        xml_doc = etree.parse(xml_path)
 
         if not dtd.validate(xml_doc):
             errors = self._format_errors(dtd.error_log)
@@ -106,18 +134,10 @@ class XMLValidator:
             ValidationError: If validation fails.
             FileNotFoundError: If any file does not exist.
         """
-        xml_file = Path(xml_file)
-        rng_file = Path(rng_file)
-
-        if not xml_file.exists():
-            raise FileNotFoundError(f"XML file not found: {xml_file}")
-        if not rng_file.exists():
-            raise FileNotFoundError(f"RelaxNG file not found: {rng_file}")
+        xml_path = self._stat_file(xml_file, "XML")[0]
+        relaxng = self._load_schema(etree.RelaxNG, rng_file, "RelaxNG")
 
-        relaxng_doc = etree.parse(str(rng_file))
-        relaxng = etree.RelaxNG(relaxng_doc)
-
-        xml_doc = etree.parse(str(xml_file))
+        xml_doc = etree.parse(xml_path)
 
         if not relaxng.validate(xml_doc):
             errors = self._format_errors(relaxng.error_log)
@@ -135,19 +155,74 @@ class XMLValidator:
         Returns:
             True if the XML is well-formed, False otherwise.
         """
-        try:
-            # Handle empty string
-            if not xml_input or (isinstance(xml_input, str) and not xml_input.strip()):
-                return False
+        # Handle empty string
+        if not xml_input or (isinstance(xml_input, str) and not xml_input.strip()):
+            return False
 
-            if isinstance(xml_input, (str, Path)) and Path(xml_input).exists():
-                etree.parse(str(xml_input))
+        # A new parser per call, a feed parser shared between threads would
+        # mix their data in one libxml2 context
+        parser = _well_formed_parser()
+
+        try:
+            # Feed the document, freeing the elements it has parsed
+            if os.path.isfile(xml_input):
+                with open(xml_input, "rb") as f:
+                    for data in iter(lambda: f.read(_FEED_SIZE), b""):
+                        parser.feed(data)
+                        _discard_parsed(parser)
             else:
-                etree.fromstring(str(xml_input).encode("utf-8"))
+                parser.feed(str(xml_input).encode("utf-8"))
+
+            parser.close()
             return True
         except (etree.XMLSyntaxError, OSError):
             return False
 
+    def _stat_file(self, file: Union[str, Path], label: str) -> Tuple[str, os.stat_result]:
+        """
+        Check that a file exists with a single stat call.
+
+        Args:
+            file: Path to the file.
+            label: File type used in the error message.
+
+        Returns:
+            Tuple (path, stat_result).
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = os.fspath(file)
+        try:
+            return path, os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{label} file not found: {file}")
+
+    def _load_schema(self, schema_type: type, schema_file: Union[str, Path], label: str) -> Any:
+        """
+        Get a compiled schema, compiling it only when the file is new or changed.
+
+        Args:
+            schema_type: etree.XMLSchema, etree.DTD or etree.RelaxNG.
+            schema_file: Path to the schema file.
+            label: Schema type used in the error message.
+
+        Returns:
+            The compiled schema.
+
+        Raises:
+            FileNotFoundError: If the schema file does not exist.
+        """
+        path, stat = self._stat_file(schema_file, label)
+        key = (schema_type, path)
+
+        cached = self._schemas.get(key)
+        if cached is None or cached[0] != stat.st_mtime_ns:
+            cached = (stat.st_mtime_ns, schema_type(file=path))
+            self._schemas[key] = cached
+
+        return cached[1]
+
     def _format_errors(self, error_log: etree._ListErrorLog) -> str:
         """
         Format validation errors into a readable string.
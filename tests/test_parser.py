@@ -2,10 +2,101 @@
 Unit tests for the XMLParser class.
 """
 
+import tempfile
+import threading
+from pathlib import Path
+
 import pytest
 from lxml import etree
 
-from xmlforge.parser import XMLParser
+from xmlforge import parser as parser_module
+from xmlforge.parser import EntityParser, XMLParser, _ColumnBuffer
+
+
+class BookParser(EntityParser):
+    """Entity parser reading books with find lookups."""
+
+    def parse_entity(self, element):
+        return [{"title": element.findtext("title"), "year": element.findtext("year")}]
+
+
+class IndexedBookParser(BookParser):
+    """Entity parser reading books from the tag index."""
+
+    index_tags = True
+
+    def parse_entity_indexed(self, element, index):
+        return [{"title": index["title"][0].text, "year": index["year"][0].text}]
+
+
+class TypedBookParser(BookParser):
+    """Entity parser converting the year column to integers."""
+
+    column_types = {"year": int}
+
+
+BOOKS_XML = (
+    "<chunk>"
+    "<book><title>Everyday Italian</title><year>2005</year></book>"
+    "<book><title>Harry Potter</title><year>2005</year></book>"
+    "</chunk>"
+)
+
+
+class TestEntityParser:
+    """Test cases for EntityParser class."""
+
+    def test_parse(self):
+        """Test parsing a chunk of entities into a DataFrame."""
+        pytest.importorskip("pandas")
+        chunk = etree.fromstring(BOOKS_XML)
+        df = BookParser("pandas").parse(chunk)
+        assert list(df["title"]) == ["Everyday Italian", "Harry Potter"]
+
+    def test_parse_indexed(self):
+        """Test parsing entities through the tag index."""
+        pytest.importorskip("pandas")
+        chunk = etree.fromstring(BOOKS_XML)
+        df = IndexedBookParser("pandas").parse(chunk)
+        assert list(df["title"]) == ["Everyday Italian", "Harry Potter"]
+        assert list(df["year"]) == ["2005", "2005"]
+
+    def test_parse_polars(self):
+        """Test parsing a chunk of entities into a Polars DataFrame."""
+        pytest.importorskip("polars")
+        chunk = etree.fromstring(BOOKS_XML)
+        df = BookParser("polars").parse(chunk)
+        assert df["title"].to_list() == ["Everyday Italian", "Harry Potter"]
+
+    def test_parse_column_types(self):
+        """Test converting declared numeric columns."""
+        pytest.importorskip("pandas")
+        chunk = etree.fromstring(BOOKS_XML)
+        df = TypedBookParser("pandas").parse(chunk)
+        assert df["year"].dtype == "int64"
+        assert list(df["year"]) == [2005, 2005]
+
+    def test_column_buffer_fills_missing_keys(self):
+        """Test that keys missing from an entity are filled with None."""
+        buffer = _ColumnBuffer()
+        buffer.extend([{"a": 1, "b": 2}, {"a": 3}, {"c": 4}])
+        assert len(buffer) == 3
+        assert buffer.columns == {"a": [1, 3, None], "b": [2, None, None], "c": [None, None, 4]}
+
+    def test_parse_target_tag(self):
+        """Test parsing only chunk children with the target tag."""
+        pytest.importorskip("pandas")
+        chunk = etree.fromstring(BOOKS_XML)
+        chunk.append(etree.fromstring("<magazine><title>Vogue</title></magazine>"))
+        df = BookParser("pandas", target_tag="book").parse(chunk)
+        assert list(df["title"]) == ["Everyday Italian", "Harry Potter"]
+
+    def test_index_entity(self):
+        """Test indexing an entity's descendants by tag."""
+        element = etree.fromstring("<book><a>1</a><b><a>2</a></b><!-- c --></book>")
+        index = EntityParser._index_entity(element)
+        assert set(index) == {"a", "b"}
+        assert [a.text for a in index["a"]] == ["1", "2"]
 
 
 class TestXMLParser:
@@ -21,6 +112,29 @@ class TestXMLParser:
         parser = XMLParser(encoding="utf-16")
         assert parser.encoding == "utf-16"
 
+    def test_parser_reused_per_thread(self):
+        """Test that the lxml parser is cached per thread."""
+        parser = XMLParser()
+        assert parser.parser is parser.parser
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(parser.parser))
+        thread.start()
+        thread.join()
+        assert other[0] is not parser.parser
+
+    def test_parse_string_entities_and_ids(self):
+        """Test that internal entities are expanded and IDs are collected."""
+        parser = XMLParser()
+        xml_string = (
+            '<!DOCTYPE r [<!ENTITY co "ACME Corp"><!ATTLIST name key ID #IMPLIED>]>'
+            '<r><name key="a1">&co;</name></r>'
+        )
+        element = parser.parse_string(xml_string)
+
+        assert parser.to_dict(element)["name"]["@text"] == "ACME Corp"
+        assert len(etree.XPath("id('a1')")(element)) == 1
+
     def test_parse_string_valid_xml(self):
         """Test parsing a valid XML string."""
         parser = XMLParser()
@@ -37,6 +151,33 @@ class TestXMLParser:
         with pytest.raises(etree.XMLSyntaxError):
             parser.parse_string(xml_string)
 
+    def test_parse_file(self):
+        """Test parsing an XML file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text("<root><child>value</child></root>")
+
+            tree = XMLParser().parse_file(xml_file)
+            assert tree.getroot().findtext("child") == "value"
+
+    def test_parse_file_nonexistent(self):
+        """Test parsing a missing file raises FileNotFoundError."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(FileNotFoundError, match="File not found"):
+                XMLParser().parse_file(Path(temp_dir) / "missing.xml")
+
+    def test_parse_file_memory_mapped(self, monkeypatch):
+        """Test parsing a file above the memory map threshold."""
+        monkeypatch.setattr(parser_module, "_MMAP_THRESHOLD", 0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text("<root><child>value</child></root>")
+
+            tree = XMLParser().parse_file(xml_file)
+            assert tree.getroot().findtext("child") == "value"
+            assert tree.docinfo.URL == str(xml_file)
+
     def test_to_dict_simple(self):
         """Test converting simple XML element to dictionary."""
         parser = XMLParser()
@@ -57,6 +198,17 @@ class TestXMLParser:
         assert result["child"]["@attributes"]["name"] == "test"
         assert result["child"]["@text"] == "value"
 
+    def test_to_dict_without_copying_attributes(self):
+        """Test converting XML element with live attribute mappings."""
+        parser = XMLParser()
+        xml_string = '<root><child id="1" name="test">value</child></root>'
+        element = parser.parse_string(xml_string)
+        result = parser.to_dict(element, copy_attribs=False)
+        attributes = result["child"]["@attributes"]
+        assert not isinstance(attributes, dict)
+        assert attributes["id"] == "1"
+        assert dict(attributes) == {"id": "1", "name": "test"}
+
     def test_to_dict_multiple_children(self):
         """Test converting XML element with multiple children to dictionary."""
         parser = XMLParser()
@@ -65,3 +217,89 @@ class TestXMLParser:
         result = parser.to_dict(element)
         assert isinstance(result["child"], list)
         assert len(result["child"]) == 2
+
+    def test_to_dict_tag_filter(self):
+        """Test converting only children with a given tag."""
+        parser = XMLParser()
+        xml_string = "<root><child><a>1</a></child><other/><child/></root>"
+        element = parser.parse_string(xml_string)
+        result = parser.to_dict(element, tag_filter="child")
+        assert result == {"child": [{"a": {"@text": "1"}}, {}]}
+
+    def test_to_dict_strip_ns(self):
+        """Test converting namespaced XML with namespace-free keys."""
+        parser = XMLParser()
+        xml_string = '<root xmlns="http://a" xmlns:b="http://b"><child/><b:child/></root>'
+        element = parser.parse_string(xml_string)
+
+        assert set(parser.to_dict(element)) == {"{http://a}child", "{http://b}child"}
+        result = parser.to_dict(element, strip_ns=True)
+        assert list(result) == ["child"]
+        assert len(result["child"]) == 2
+
+    def test_compile_to_dict(self):
+        """Test compiling a converter from a sample element."""
+        parser = XMLParser()
+        chunk = parser.parse_string(
+            "<bookstore>"
+            "<book><title>Everyday Italian</title><year>2005</year><price>30.00</price>"
+            "<tag>a</tag><tag>b</tag></book>"
+            "<book><title>Harry Potter</title><year>2005</year><price>29.99</price>"
+            "<tag>c</tag><tag>d</tag></book>"
+            "</bookstore>"
+        )
+
+        convert = parser.compile_to_dict(chunk[0], types={"year": int, "price": float})
+        assert parser.compile_to_dict(chunk[1], types={"year": int, "price": float}) is convert
+        assert convert(chunk[1]) == {
+            "title": "Harry Potter",
+            "year": 2005,
+            "price": 29.99,
+            "tag": ["c", "d"],
+        }
+
+    def test_compile_to_dict_keeps_text_by_default(self):
+        """Test that fields stay strings unless a type is given."""
+        parser = XMLParser()
+        chunk = parser.parse_string(
+            "<r><address><zip>02134</zip></address><address><zip>SW1A</zip></address></r>"
+        )
+
+        convert = parser.compile_to_dict(chunk[0])
+        assert convert(chunk[0]) == {"zip": "02134"}
+        assert convert(chunk[1]) == {"zip": "SW1A"}
+
+    def test_compile_to_dict_cache_bounded(self):
+        """Test that converters compiled with new type callables do not accumulate."""
+        parser = XMLParser()
+        sample = parser.parse_string("<book><year>2005</year></book>")
+
+        for _ in range(parser_module._CONVERTER_CACHE_SIZE + 10):
+            convert = parser.compile_to_dict(sample, types={"year": lambda text: int(text)})
+            assert convert(sample) == {"year": 2005}
+
+        cache_info = XMLParser._generate_converter.cache_info()
+        assert cache_info.currsize <= parser_module._CONVERTER_CACHE_SIZE
+
+    def test_to_dict_deeply_nested(self):
+        """Test converting a document deeper than the recursion limit."""
+        parser = XMLParser()
+        root = etree.Element("root")
+        node = root
+        for _ in range(5000):
+            node = etree.SubElement(node, "level")
+        node.text = "bottom"
+
+        result = parser.to_dict(root)
+        for _ in range(5000):
+            result = result["level"]
+        assert result == {"@text": "bottom"}
+
+    def test_to_dict_preserves_child_order(self):
+        """Test that repeated children keep document order."""
+        parser = XMLParser()
+        xml_string = "<root><child>1</child><other/><child>2</child><child>3</child></root>"
+        element = parser.parse_string(xml_string)
+        result = parser.to_dict(element)
+        assert [child["@text"] for child in result["child"]] == ["1", "2", "3"]
+        assert result["other"] == {}
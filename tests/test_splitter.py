@@ -2,14 +2,24 @@
 Unit tests for the XMLSplitter class.
 """
 
+import os
 import tempfile
+import tracemalloc
 import zipfile
 from pathlib import Path
 
 import pytest
 from lxml import etree
 
-from xmlforge.splitter import XMLSplitter
+from xmlforge.parser import EntityParser
+from xmlforge.splitter import XMLSplitter, _literal_suffix
+
+
+class ItemParser(EntityParser):
+    """Entity parser reading the name of each item."""
+
+    def parse_entity(self, element):
+        return [{"name": element.findtext("name")}]
 
 
 class TestXMLSplitter:
@@ -21,6 +31,20 @@ class TestXMLSplitter:
         assert splitter.target_tag == "item"
         assert splitter.chunk_size == 100
 
+    def test_init_namespaced_target_tag(self):
+        """Test that a (namespace, local) target tag is split on."""
+        splitter = XMLSplitter(target_tag=("http://example.com", "item"))
+        assert splitter.target_tag == "{http://example.com}item"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                '<root xmlns="http://example.com"><item>1</item><other/><item>2</item></root>'
+            )
+
+            chunks = list(splitter.split_file(xml_file))
+            assert [item.text for item in chunks[0]] == ["1", "2"]
+
     def test_init_default_chunk_size(self):
         """Test splitter initialization with default chunk size."""
         splitter = XMLSplitter(target_tag="item")
@@ -42,6 +66,13 @@ class TestXMLSplitter:
         assert splitter.pattern == "*.xml"
         assert splitter.recursive is False
 
+    def test_literal_suffix(self):
+        """Test that only "*" + literal patterns are matched as a suffix."""
+        assert _literal_suffix("*.xml") == ".xml"
+        assert _literal_suffix("data_*.xml") is None
+        assert _literal_suffix("*.[xX]ml") is None
+        assert _literal_suffix("*") is None
+
     def test_split_file_nonexistent_path(self):
         """Test split_file with non-existent path raises FileNotFoundError."""
         splitter = XMLSplitter(target_tag="item")
@@ -60,6 +91,17 @@ class TestXMLSplitter:
         with pytest.raises((FileNotFoundError, ValueError)):
             list(splitter.split_file(temp_path))
 
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+    def test_split_file_special_file(self):
+        """Test split_file with a path that is neither file nor directory raises ValueError."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fifo_path = Path(temp_dir) / "pipe.xml"
+            os.mkfifo(fifo_path)
+
+            splitter = XMLSplitter(target_tag="item")
+            with pytest.raises(ValueError, match="Invalid path"):
+                list(splitter.split_file(fifo_path))
+
     def test_split_directory_no_xml_files(self):
         """Test split_file with directory containing no XML files."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -87,6 +129,16 @@ class TestXMLSplitter:
             assert len(chunks) == 1  # All items in one chunk
             assert len(chunks[0]) == 2  # 2 items from data_*.xml files
 
+    def test_split_directory_pattern_changed_after_init(self):
+        """Test that the pattern attribute is read when the directory is walked."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "data.xml").write_text("<root><item>1</item></root>")
+            (Path(temp_dir) / "data.txt").write_text("<root><item>2</item></root>")
+
+            splitter = XMLSplitter(target_tag="item")
+            splitter.pattern = "*.txt"
+            assert [item.text for item in list(splitter.split_file(temp_dir))[0]] == ["2"]
+
     def test_split_directory_recursive(self):
         """Test split_file with recursive directory search."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -111,6 +163,21 @@ class TestXMLSplitter:
             assert len(chunks) == 1
             assert len(chunks[0]) == 2  # Both files found
 
+    def test_split_directory_pattern_with_directories(self):
+        """Test patterns with directory parts as accepted by Path.glob."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            (temp_path / "top.xml").write_text("<root><item>1</item></root>")
+            (temp_path / "sub").mkdir()
+            (temp_path / "sub" / "nested.xml").write_text("<root><item>2</item></root>")
+
+            splitter = XMLSplitter(target_tag="item", pattern="sub/*.xml")
+            assert [item.text for item in list(splitter.split_file(temp_dir))[0]] == ["2"]
+
+            splitter = XMLSplitter(target_tag="item", pattern="**/*.xml")
+            items = [item.text for item in list(splitter.split_file(temp_dir))[0]]
+            assert sorted(items) == ["1", "2"]
+
     def test_split_zip_file(self):
         """Test split_file with ZIP file containing XML files."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -151,6 +218,38 @@ class TestXMLSplitter:
             with pytest.raises(ValueError, match="No XML files found in ZIP"):
                 list(splitter.split_file(zip_path))
 
+    def test_split_zip_file_skips_metadata(self):
+        """Test that ZIP directories and macOS metadata entries are skipped."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path = Path(temp_dir) / "test.zip"
+
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("data.xml/", "")
+                zf.writestr("data/file1.xml", "<root><item>1</item></root>")
+                zf.writestr("data/._file1.xml", "not xml")
+                zf.writestr("__MACOSX/data/._file1.xml", "not xml")
+                zf.writestr("file2.xml", "<root><item>2</item></root>")
+
+            splitter = XMLSplitter(target_tag="item")
+            chunks = list(splitter.split_file(zip_path))
+
+            assert [item.text for item in chunks[0]] == ["1", "2"]
+
+    def test_split_zip_file_with_pattern(self):
+        """Test that the pattern selects ZIP members regardless of case."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path = Path(temp_dir) / "test.zip"
+
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("data/data_1.xml", "<root><item>1</item></root>")
+                zf.writestr("DATA_2.XML", "<root><item>2</item></root>")
+                zf.writestr("other.xml", "<root><item>3</item></root>")
+
+            splitter = XMLSplitter(target_tag="item", pattern="data_*.xml")
+            chunks = list(splitter.split_file(zip_path))
+
+            assert [item.text for item in chunks[0]] == ["1", "2"]
+
     def test_split_invalid_zip_file(self):
         """Test split_file with invalid ZIP file."""
         with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_file:
@@ -164,6 +263,24 @@ class TestXMLSplitter:
         finally:
             temp_path.unlink()
 
+    def test_split_zip_file_corrupt_entry(self):
+        """Test that a corrupt ZIP member fails up front when the ZIP is not trusted."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path = Path(temp_dir) / "test.zip"
+            content = b"<root><item>1</item></root>"
+
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+                zf.writestr("file1.xml", "<root><item>0</item></root>")
+                zf.writestr("file2.xml", content)
+
+            # Change the stored data of file2.xml without updating its CRC
+            data = zip_path.read_bytes()
+            zip_path.write_bytes(data.replace(content, content.replace(b"1", b"2")))
+
+            splitter = XMLSplitter(target_tag="item", trust_zip=False)
+            with pytest.raises(ValueError, match="corrupt entry file2.xml"):
+                list(splitter.split_file(zip_path))
+
     def test_create_chunk_tree(self):
         """Test _create_chunk_tree method."""
         splitter = XMLSplitter(target_tag="item")
@@ -205,3 +322,243 @@ class TestXMLSplitter:
             root = tree.getroot()
             assert root.tag == "chunk"
             assert len(root) == 2
+
+    def test_write_chunk_pretty_print(self):
+        """Test that chunk files are only indented when asked for."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            elem = etree.fromstring("<item><name>a</name></item>")
+
+            XMLSplitter(target_tag="item")._write_chunk([elem], output_dir, 0)
+            XMLSplitter(target_tag="item", pretty_print=True)._write_chunk([elem], output_dir, 1)
+
+            compact = (output_dir / "chunk_0000.xml").read_text()
+            pretty = (output_dir / "chunk_0001.xml").read_text()
+            assert compact.endswith("<chunk><item><name>a</name></item></chunk>")
+            assert "\n  <name>a</name>\n" in pretty
+
+    def test_split_file_sax(self):
+        """Test split_file_sax writes the same chunks as split_file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            xml_file = temp_path / "input.xml"
+            xml_file.write_text(
+                '<root><item id="1">a &amp; b</item><skip>x</skip>'
+                '<item id="2"><name>two</name></item><item id="3"/></root>'
+            )
+
+            splitter = XMLSplitter(target_tag="item", chunk_size=2)
+            written = splitter.split_file_sax(xml_file, temp_path / "output")
+
+            assert written == 2
+            first = etree.parse(str(temp_path / "output" / "chunk_0000.xml")).getroot()
+            second = etree.parse(str(temp_path / "output" / "chunk_0001.xml")).getroot()
+
+            assert first.tag == "chunk"
+            assert [item.get("id") for item in first] == ["1", "2"]
+            assert first[0].text == "a & b"
+            assert first[1].findtext("name") == "two"
+            assert [item.get("id") for item in second] == ["3"]
+
+    def test_split_file_sax_namespaces(self):
+        """Test split_file_sax matches Clark names and declares in-scope namespaces."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            xml_file = temp_path / "input.xml"
+            xml_file.write_text(
+                '<root xmlns:p="urn:p" xmlns="urn:d"><p:item p:id="1"><name>a</name>'
+                '<q:x xmlns:q="urn:q"/></p:item><item/></root>'
+            )
+
+            splitter = XMLSplitter(target_tag=("urn:p", "item"))
+            assert splitter.split_file_sax(xml_file, temp_path / "output") == 1
+
+            chunk = etree.parse(str(temp_path / "output" / "chunk_0000.xml")).getroot()
+            assert [item.tag for item in chunk] == ["{urn:p}item"]
+            assert chunk[0].get("{urn:p}id") == "1"
+            assert [child.tag for child in chunk[0]] == ["{urn:d}name", "{urn:q}x"]
+
+    def test_split_file_keeps_element_content(self):
+        """Test that split elements keep their attributes and children."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                "<root>"
+                '<group><item id="1"><name>a</name></item><other/></group>'
+                '<group><item id="2"><name>b</name></item><item id="3"><name>c</name></item></group>'
+                "</root>"
+            )
+
+            splitter = XMLSplitter(target_tag="item", chunk_size=2)
+            chunks = list(splitter.split_file(xml_file))
+
+            items = [item for chunk in chunks for item in chunk]
+            assert [len(chunk) for chunk in chunks] == [2, 1]
+            assert [item.get("id") for item in items] == ["1", "2", "3"]
+            assert [item.findtext("name") for item in items] == ["a", "b", "c"]
+
+    def test_split_file_sparse_targets(self, monkeypatch):
+        """Test that content between sparse targets is freed before a chunk fills."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            # Each noise block is larger than one iterparse read
+            noise = "<noise>" + "<n/>" * 20000 + "</noise>"
+            xml_file.write_text(
+                "<root>" + "".join(f'{noise}<item id="{i}"/>' for i in range(20)) + "</root>"
+            )
+
+            splitter = XMLSplitter(target_tag="item")
+            iter_elements = splitter._iter_elements
+            tree_sizes = []
+
+            def recording(xml_sources, tag):
+                for element in iter_elements(xml_sources, tag):
+                    tree_sizes.append(sum(1 for _ in element.getroottree().iter()))
+                    yield element
+
+            monkeypatch.setattr(splitter, "_iter_elements", recording)
+            chunks = list(splitter.split_file(xml_file))
+
+            assert [item.get("id") for item in chunks[0]] == [str(i) for i in range(20)]
+            # Only the noise since the previous item is left in the tree
+            assert max(tree_sizes) < 3 * 20000
+
+    def test_split_file_expands_internal_entities(self):
+        """Test that chunks are readable without the DTD and keep mixed content."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                '<!DOCTYPE root [<!ENTITY e "expanded">]>\n<root>\n'
+                "  <item>&e;</item>\n  <item><p><b>Hello</b> <i>world</i></p></item>\n</root>"
+            )
+
+            output_dir = Path(temp_dir) / "output"
+            splitter = XMLSplitter(target_tag="item")
+            list(splitter.split_file(xml_file, output_dir))
+
+            chunk = etree.parse(str(output_dir / "chunk_0000.xml")).getroot()
+            assert chunk[0].text == "expanded"
+            assert "".join(chunk[1].itertext()) == "Hello world"
+
+    def test_split_file_to_zip(self):
+        """Test writing all chunks into a single ZIP file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            xml_file = temp_path / "input.xml"
+            xml_file.write_text(
+                "<root>" + "".join(f"<item>{i}</item>" for i in range(5)) + "</root>"
+            )
+
+            zip_path = temp_path / "output" / "chunks.zip"
+            splitter = XMLSplitter(target_tag="item", chunk_size=2)
+            list(splitter.split_file(xml_file, zip_path))
+
+            with zipfile.ZipFile(zip_path) as zf:
+                assert zf.namelist() == ["chunk_0000.xml", "chunk_0001.xml", "chunk_0002.xml"]
+                assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_DEFLATED}
+
+            chunks = list(XMLSplitter(target_tag="item", chunk_size=10).split_file(zip_path))
+            assert [item.text for item in chunks[0]] == ["0", "1", "2", "3", "4"]
+
+    def test_split_file_parallel(self):
+        """Test splitting multiple files to disk in worker processes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_dir = temp_path / "input"
+            input_dir.mkdir()
+            (input_dir / "a.xml").write_text("<root><item>1</item><item>2</item></root>")
+            (input_dir / "b.xml").write_text("<root><item>3</item></root>")
+
+            output_dir = temp_path / "output"
+            splitter = XMLSplitter(target_tag="item", chunk_size=1, workers=2)
+            list(splitter.split_file(input_dir, output_dir))
+
+            files = sorted(output_dir.iterdir())
+            assert [f.name for f in files] == ["chunk_0000.xml", "chunk_0001.xml", "chunk_0002.xml"]
+            items = [etree.parse(str(f)).findtext("item") for f in files]
+            assert sorted(items) == ["1", "2", "3"]
+
+    def test_split_file_large_chunk_size(self):
+        """Test that memory follows the elements read, not the chunk size."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text("<root>" + "<item/>" * 10 + "</root>")
+
+            splitter = XMLSplitter(target_tag="item", chunk_size=50_000_000)
+            tracemalloc.start()
+            try:
+                chunks = list(splitter.split_file(xml_file))
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            assert [len(chunk) for chunk in chunks] == [10]
+            assert peak < 10_000_000
+
+    def test_split_file_writer_threads(self):
+        """Test writing chunk files from a thread pool."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                "<root>" + "".join(f"<item>{i}</item>" for i in range(25)) + "</root>"
+            )
+
+            output_dir = Path(temp_dir) / "output"
+            splitter = XMLSplitter(target_tag="item", chunk_size=2, writer_threads=2)
+            list(splitter.split_file(xml_file, output_dir))
+
+            files = sorted(output_dir.iterdir())
+            assert len(files) == 13
+            items = [item.text for f in files for item in etree.parse(str(f)).getroot()]
+            assert items == [str(i) for i in range(25)]
+
+    def test_map_parse(self):
+        """Test splitting and parsing chunks in worker processes."""
+        pytest.importorskip("pandas")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                "<root>" + "".join(f"<item><name>{i}</name></item>" for i in range(5)) + "</root>"
+            )
+
+            splitter = XMLSplitter(target_tag="item", chunk_size=2)
+            df = splitter.map_parse(xml_file, ItemParser("pandas"), workers=2)
+
+            assert list(df["name"]) == ["0", "1", "2", "3", "4"]
+
+    def test_stream_parse(self):
+        """Test parsing target elements into DataFrames in one pass."""
+        pytest.importorskip("pandas")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(
+                "<root>" + "".join(f"<item><name>{i}</name></item>" for i in range(5)) + "</root>"
+            )
+
+            splitter = XMLSplitter(target_tag="item", chunk_size=2)
+            frames = list(splitter.stream_parse(xml_file, ItemParser("pandas"), batch_size=3))
+
+            assert [len(df) for df in frames] == [3, 2]
+            assert list(frames[0]["name"]) + list(frames[1]["name"]) == ["0", "1", "2", "3", "4"]
+
+    def test_iter_released_sparse_targets(self):
+        """Test that content between sparse targets is freed after every element."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            # Each noise block is larger than one iterparse read
+            noise = "<noise>" + "<n/>" * 20000 + "</noise>"
+            xml_file.write_text(
+                "<root>" + "".join(f'{noise}<item id="{i}"/>' for i in range(20)) + "</root>"
+            )
+
+            splitter = XMLSplitter(target_tag="item")
+            tree_sizes = [
+                sum(1 for _ in element.getroottree().iter())
+                for element in splitter._iter_released([(xml_file, None)], "item")
+            ]
+
+            assert len(tree_sizes) == 20
+            # Only the noise since the previous item is left in the tree
+            assert max(tree_sizes) < 3 * 20000
@@ -2,10 +2,21 @@
 Unit tests for the XMLTransformer class.
 """
 
+import os
+import tempfile
+from pathlib import Path
+
 from lxml import etree
 
 from xmlforge.transformer import XMLTransformer
 
+XSLT = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+    <xsl:param name="label" select="'none'"/>
+    <xsl:template match="/">
+        <result label="{$label}"><xsl:value-of select="count(//item)"/></result>
+    </xsl:template>
+</xsl:stylesheet>"""
+
 
 class TestXMLTransformer:
     """Test cases for XMLTransformer class."""
@@ -16,6 +27,62 @@ class TestXMLTransformer:
         assert transformer.xslt_file is None
         assert transformer.transform is None
 
+    def test_xslt_compiled_once_per_file_version(self):
+        """Test that the compiled XSLT is reused until the file changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xslt_file = Path(temp_dir) / "transform.xslt"
+            xslt_file.write_text(XSLT)
+
+            first = XMLTransformer(xslt_file)
+            second = XMLTransformer(str(xslt_file))
+            assert first.transform is second.transform
+
+            stat = xslt_file.stat()
+            os.utime(xslt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert XMLTransformer(xslt_file).transform is not first.transform
+
+    def test_transform_file_with_parsed_tree(self):
+        """Test transforming an already parsed tree without reading a file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xslt_file = Path(temp_dir) / "transform.xslt"
+            xslt_file.write_text(XSLT)
+
+            transformer = XMLTransformer(xslt_file)
+            tree = etree.ElementTree(etree.fromstring("<root><item/><item/></root>"))
+            result = transformer.transform_file_with_xslt(tree, label="x")
+
+            assert result.getroot().text == "2"
+            assert result.getroot().get("label") == "x"
+
+    def test_transform_many(self):
+        """Test transforming several elements with the same parameters."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xslt_file = Path(temp_dir) / "transform.xslt"
+            xslt_file.write_text(XSLT)
+
+            transformer = XMLTransformer(xslt_file)
+            elements = [etree.fromstring("<root>" + "<item/>" * i + "</root>") for i in range(3)]
+            results = transformer.transform_many(elements, label="batch")
+
+            assert [result.getroot().text for result in results] == ["0", "1", "2"]
+            assert {result.getroot().get("label") for result in results} == {"batch"}
+
+            single = transformer.transform_element_with_xslt(elements[2])
+            assert single.getroot().get("label") == "none"
+
+    def test_add_namespace(self):
+        """Test adding prefixed and default namespaces to an element."""
+        transformer = XMLTransformer()
+        element = etree.fromstring(b'<root x="1"><a/><b/><c/></root>')
+
+        result = transformer.add_namespace(element, "http://example.com", "ex")
+        assert result.nsmap == {"ex": "http://example.com"}
+        assert result.get("x") == "1"
+        assert [child.tag for child in result] == ["a", "b", "c"]
+
+        result = transformer.add_namespace(etree.fromstring(b"<root/>"), "http://example.com")
+        assert result.nsmap == {None: "http://example.com"}
+
     def test_remove_namespace(self):
         """Test removing namespaces from XML element."""
         transformer = XMLTransformer()
@@ -126,6 +193,54 @@ class TestXMLTransformer:
         assert level3 is not None
         assert level3.get("parent_id") == "2"
 
+    def test_flatten_hierarchy_deeper_than_recursion_limit(self):
+        """Test flattening nesting deeper than Python's recursion limit."""
+        transformer = XMLTransformer()
+
+        depth = 2000
+        element = etree.Element("Product", id="0")
+        parent = element
+        for i in range(1, depth):
+            parent = etree.SubElement(parent, "Product", id=str(i))
+
+        flattened = transformer.flatten_hierarchy(element, "Product")
+
+        assert [elem.get("id") for elem in flattened] == ["0"] + [
+            str(i) for i in range(depth - 1, 0, -1)
+        ]
+        assert flattened[1].get("parent_id") == str(depth - 2)
+
+    def test_flatten_hierarchy_order(self):
+        """Test that each element follows the elements flattened out of it."""
+        transformer = XMLTransformer()
+        xml_string = (
+            '<P id="1"><P id="2"><P id="3"/></P>' '<X><P id="4"><P id="5"/></P></X><P id="6"/></P>'
+        )
+
+        flattened = transformer.flatten_hierarchy(etree.fromstring(xml_string), "P")
+        assert [elem.get("id") for elem in flattened] == ["1", "5", "3", "2", "6"]
+        assert flattened[0].find("X/P").get("id") == "4"
+
+    def test_iter_flatten(self):
+        """Test that iter_flatten yields the elements of flatten_hierarchy one by one."""
+        transformer = XMLTransformer()
+
+        xml_string = '<Product id="1"><Product><Product id="3"/></Product></Product>'
+        element = etree.fromstring(xml_string)
+        flattened = transformer.iter_flatten(element, "Product")
+        # IDs are assigned on the input before the iterator is advanced
+        middle_id = element[0].get("id")
+        assert middle_id
+
+        root = next(flattened)
+        assert root.get("id") == "1"
+        assert len(root) == 0
+
+        rest = list(flattened)
+        assert [elem.get("id") for elem in rest] == ["3", middle_id]
+        assert [elem.get("parent_id") for elem in rest] == [middle_id, "1"]
+        assert all(elem.getparent() is None for elem in rest)
+
     def test_flatten_hierarchy_mixed_content(self):
         """Test flattening with mixed content (non-target tags preserved)."""
         transformer = XMLTransformer()
@@ -2,7 +2,23 @@
 Unit tests for the XMLValidator class.
 """
 
-from xmlforge.validator import XMLValidator
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from xmlforge.validator import ValidationError, XMLValidator
+
+XSD = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="root">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="child" type="xs:integer" maxOccurs="unbounded"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>"""
 
 
 class TestXMLValidator:
@@ -13,6 +29,39 @@ class TestXMLValidator:
         validator = XMLValidator()
         assert validator is not None
 
+    def test_validate_with_xsd(self):
+        """Test XSD validation reusing the compiled schema."""
+        validator = XMLValidator()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            xsd_file = temp_path / "schema.xsd"
+            xsd_file.write_text(XSD)
+            valid_file = temp_path / "valid.xml"
+            valid_file.write_text("<root><child>1</child></root>")
+            invalid_file = temp_path / "invalid.xml"
+            invalid_file.write_text("<root><child>one</child></root>")
+
+            assert validator.validate_with_xsd(valid_file, xsd_file) is True
+            assert len(validator._schemas) == 1
+
+            with pytest.raises(ValidationError, match="XSD validation failed"):
+                validator.validate_with_xsd(invalid_file, str(xsd_file))
+            assert len(validator._schemas) == 1
+
+    def test_validate_with_xsd_missing_files(self):
+        """Test that missing XML and schema files are reported."""
+        validator = XMLValidator()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text("<root/>")
+
+            with pytest.raises(FileNotFoundError, match="XML file not found"):
+                validator.validate_with_xsd(Path(temp_dir) / "missing.xml", xml_file)
+            with pytest.raises(FileNotFoundError, match="XSD file not found"):
+                validator.validate_with_xsd(xml_file, Path(temp_dir) / "missing.xsd")
+
     def test_is_well_formed_valid_xml_string(self):
         """Test checking well-formed XML string."""
         validator = XMLValidator()
@@ -29,3 +78,66 @@ class TestXMLValidator:
         """Test checking empty string."""
         validator = XMLValidator()
         assert validator.is_well_formed("") is False
+
+    def test_is_well_formed_file(self):
+        """Test checking well-formed and malformed XML files."""
+        validator = XMLValidator()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            valid_file = Path(temp_dir) / "valid.xml"
+            valid_file.write_text("<root>" + "<child>value</child>" * 10000 + "</root>")
+            invalid_file = Path(temp_dir) / "invalid.xml"
+            invalid_file.write_text("<root><child>value</child>")
+
+            assert validator.is_well_formed(valid_file) is True
+            assert validator.is_well_formed(str(invalid_file)) is False
+
+    def test_is_well_formed_undeclared_prefix(self):
+        """Test that an undeclared namespace prefix is rejected like the parsers do."""
+        validator = XMLValidator()
+        xml_string = "<a><x:b/></a>"
+        assert validator.is_well_formed(xml_string) is False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text(xml_string)
+            assert validator.is_well_formed(xml_file) is False
+
+        assert validator.is_well_formed('<a xmlns:x="urn:x"><x:b/></a>') is True
+
+    def test_is_well_formed_multibyte_encoding(self):
+        """Test checking a file in a multi-byte legacy encoding."""
+        validator = XMLValidator()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_bytes(
+                '<?xml version="1.0" encoding="Shift_JIS"?><root>日本</root>'.encode("shift_jis")
+            )
+            assert validator.is_well_formed(xml_file) is True
+
+    def test_is_well_formed_large_text(self):
+        """Test that text beyond libxml2's default size limit is accepted."""
+        validator = XMLValidator()
+        xml_string = "<root>" + "x" * 20_000_000 + "</root>"
+        assert validator.is_well_formed(xml_string) is True
+
+    def test_is_well_formed_after_failure(self):
+        """Test that a failed check does not affect the next one."""
+        validator = XMLValidator()
+        assert validator.is_well_formed("<root><child>") is False
+        assert validator.is_well_formed("<root><child/></root>") is True
+        assert validator.is_well_formed("<root/>") is True
+
+    def test_is_well_formed_concurrent(self):
+        """Test that concurrent checks on one validator do not share parser state."""
+        validator = XMLValidator()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_file = Path(temp_dir) / "input.xml"
+            xml_file.write_text("<root>" + "<child>value</child>" * 200000 + "</root>")
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(validator.is_well_formed, [xml_file] * 8))
+
+            assert results == [True] * 8